@@ -1,10 +1,18 @@
 import asyncio
 import logging
 import os
+import signal
 import sys
+from typing import Any, Dict, List, cast
 
 from dotenv import load_dotenv
 
+try:
+    # uvloop's libuv event loop cuts per-socket overhead for the long-lived IMAP and SMTP connections
+    import uvloop
+except ImportError:
+    uvloop = None  # type: ignore[assignment]
+
 from sampark.adapters.email.client import EmailClient, EmailMonitor, EmailDataDict
 from sampark.adapters.email.service import EmailService
 from sampark.db.database import init_db
@@ -17,59 +25,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Acknowledgment reply bodies, filled in with the sender's address
+_REPLY_TEXT_TMPL = (
+    "Hello {sender},\n\n"
+    "Thank you for your email. I've received your message and will process it soon.\n\n"
+    "Best regards,\nSampark-AI"
+)
+_REPLY_HTML_TMPL = (
+    "<p>Hello {sender},</p>"
+    "<p>Thank you for your email. I've received your message and will process it soon.</p>"
+    "<p>Best regards,<br>Sampark-AI</p>"
+)
+
 
-async def process_email_callback(email_service: EmailService, email_data: EmailDataDict) -> None:
+async def process_emails_callback(email_service: EmailService, new_emails: List[EmailDataDict]) -> None:
     """
-    Callback function to process new emails.
+    Callback function to process every new email from one check at once.
 
     Args:
         email_service: Email service instance
-        email_data: Data for a new email
+        new_emails: Data for the new emails
     """
-    logger.info(f"Processing new email: {email_data['subject']} from {email_data['sender']}")
-
-    # Create a database session that we'll use for the entire process
-    async with email_service.Session() as db_session:
-        try:
-            # Process the new email with our session
-            message = await email_service.process_new_email(email_data, db_session=db_session)
-
-            # Commit the transaction to ensure the message and thread are persisted
-            await db_session.commit()
-
-            if message:
-                # Send an automated reply using the same session
-                logger.info(f"Sending acknowledgment reply to {message.message_id}")
-
-                reply_text = (
-                    f"Hello {email_data['sender']},\n\n"
-                    f"Thank you for your email. I've received your message and will process it soon.\n\n"
-                    f"Best regards,\nSampark-AI"
-                )
-
-                reply_html = (
-                    f"<p>Hello {email_data['sender']},</p>"
-                    f"<p>Thank you for your email. I've received your message and will process it soon.</p>"
-                    f"<p>Best regards,<br>Sampark-AI</p>"
-                )
-
-                success, _ = await email_service.reply_to_email(
-                    message_id=message.message_id,
-                    body_text=reply_text,
-                    body_html=reply_html,
-                    db_session=db_session,
-                )
-
-                if success:
-                    logger.info("Sent acknowledgment reply successfully")
-                else:
-                    logger.error("Failed to send acknowledgment reply")
-            else:
-                logger.error("Failed to process email, or message already processed")
-        except Exception as e:
-            logger.error(f"Error in process_email_callback: {str(e)}")
-            await db_session.rollback()
-            # Don't re-raise; we want to continue monitoring emails even if one fails
+    logger.info(f"Processing {len(new_emails)} new emails")
+
+    # The whole batch is stored in one transaction
+    messages = await email_service.process_new_emails(cast(List[Dict[str, Any]], new_emails))
+
+    # Each acknowledgment opens its own session so the replies can be sent concurrently
+    results = await asyncio.gather(
+        *(
+            email_service.reply_to_email(
+                message_id=message.message_id,
+                body_text=_REPLY_TEXT_TMPL.format(sender=message.sender),
+                body_html=_REPLY_HTML_TMPL.format(sender=message.sender),
+            )
+            for message in messages
+        ),
+        return_exceptions=True,
+    )
+    for message, result in zip(messages, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error sending acknowledgment reply to {message.message_id}: {str(result)}")
+        elif not result[0]:
+            logger.error(f"Failed to send acknowledgment reply to {message.message_id}")
 
 
 async def main() -> None:
@@ -118,24 +116,29 @@ async def main() -> None:
         email_monitor = EmailMonitor(email_client=email_client, check_interval=check_interval)
 
         # Register callback to process new emails
-        async def callback_wrapper(email_data: EmailDataDict) -> None:
-            await process_email_callback(email_service, email_data)
+        async def callback_wrapper(new_emails: List[EmailDataDict]) -> None:
+            await process_emails_callback(email_service, new_emails)
 
         email_monitor.register_callback(callback_wrapper)
 
+        # Stop the application on SIGINT/SIGTERM
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGINT, stop_event.set)
+        loop.add_signal_handler(signal.SIGTERM, stop_event.set)
+
         # Start monitoring for emails
         logger.info(f"Starting email monitoring (checking every {check_interval} seconds)...")
         email_monitor.start()
 
-        # Keep the application running
+        # Keep the application running until a shutdown signal arrives
         try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
+            await stop_event.wait()
             logger.info("Shutting down...")
         finally:
-            # Stop the email monitor
+            # Stop the email monitor and close the client's connections
             await email_monitor.stop()
+            await email_client.aclose()
 
     except Exception as e:
         logger.error(f"Application error: {str(e)}")
@@ -143,5 +146,5 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    # Run the main application
-    asyncio.run(main())
+    # Run the main application, on uvloop when it is installed
+    asyncio.run(main(), loop_factory=uvloop.new_event_loop if uvloop is not None else None)
@@ -1,16 +1,29 @@
 import asyncio
+import contextlib
 import email
+import functools
+import hashlib
 import imaplib
+import io
 import logging
+import multiprocessing
+import os
 import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from email.charset import Charset
+from email.generator import BytesGenerator
 from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.utils import formatdate, make_msgid, parseaddr
-from typing import Any, Dict, List, Optional, Tuple, Union, Callable, TypeVar, Awaitable
+from email.policy import compat32
+from email.utils import formatdate, getaddresses, make_msgid, parseaddr
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
 
 import aiosmtplib
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +33,389 @@ EmailDataDict = Dict[str, Any]
 T = TypeVar("T")
 # Define a type for async callback functions
 AsyncCallbackT = Callable[[EmailDataDict], Awaitable[None]]
+# Define a type for async callbacks that receive every new email from one check at once
+AsyncBatchCallbackT = Callable[[List[EmailDataDict]], Awaitable[None]]
+
+# Retry policy for sending mail over SMTP
+_SMTP_MAX_ATTEMPTS = 5
+_SMTP_RETRY_MIN_WAIT = 2
+_SMTP_RETRY_MAX_WAIT = 30
+# Most SMTP connections each client keeps open, bounding how many sends run at once
+_SMTP_MAX_CONNECTIONS = 5
+# Recycle a pooled SMTP connection after this many messages, as many servers cap messages per session
+_SMTP_MAX_MESSAGES_PER_CONNECTION = 1000
+# Servers usually drop idle SMTP sessions after ~5 minutes, so check a connection with NOOP after this many seconds
+_SMTP_IDLE_CHECK_AFTER = 4 * 60
+
+# RFC 2177 asks clients to re-issue IDLE at least every 29 minutes so the server doesn't drop them
+_IDLE_TIMEOUT = 29 * 60
+# Extra seconds a read during IDLE may wait past the timeout for the server to confirm DONE before the session is
+# given up as dead; a connection dropped without a FIN would otherwise block the read forever
+_IDLE_READ_GRACE = 60
+
+# Recently parsed emails keyed by a digest of their raw bytes, so re-fetched messages skip MIME parsing
+_PARSE_CACHE_SIZE = 1024
+_parse_cache: "OrderedDict[bytes, EmailDataDict]" = OrderedDict()
+# Parsing runs in worker threads, so guard the cache
+_parse_cache_lock = threading.Lock()
+# Start parse workers from a clean server process rather than forking the caller; Windows only has spawn
+_PARSE_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# How many recently handled Message-IDs each client remembers to avoid dispatching the same email twice
+_SEEN_MESSAGE_IDS_SIZE = 10000
+
+# Policy for serializing outgoing mail: the MIME classes' default compat32, with SMTP's CRLF line endings
+_SMTP_POLICY = compat32.clone(linesep="\r\n")
+# Charsets for outgoing text parts, built once instead of on every set_payload call
+_BODY_CHARSETS = {"us-ascii": Charset("us-ascii"), "utf-8": Charset("utf-8")}
+
+# Patterns used when deriving thread IDs, compiled once at import time
+_MSGID_RE = re.compile(r"<([^<>]+)>")
+# One anchored pass over a run of prefixes; no nested quantifiers can overlap, so matching stays linear
+_SUBJECT_PREFIX_RE = re.compile(r"\s*(?:(?:re|fwd?)(?:\[\d+\])?\s*:\s*)+", re.IGNORECASE)
+# Only this much of a subject is scanned for prefixes, bounding the work on pathological subjects
+_SUBJECT_PREFIX_SCAN_LIMIT = 512
+# Pulls the UID out of a FETCH response envelope such as b"1 (UID 42 RFC822 {1234}"
+_UID_RE = re.compile(rb"UID (\d+)")
+_FLAGS_RE = re.compile(rb"FLAGS \(([^)]*)\)")
+# Fetch the whole message without setting \Seen; it is stored explicitly once the message is handled
+_FETCH_ITEMS = "(UID FLAGS BODY.PEEK[])"
+# Finding new mail only needs flags, so bodies are downloaded just for the messages that are still unseen
+_FLAGS_FETCH_ITEMS = "(UID FLAGS)"
+# A FETCH response without a literal starts with its sequence number, e.g. b"1 (UID 42 FLAGS (\Seen))"
+_FETCH_START_RE = re.compile(rb"\d+ \(")
+# A message that fails to fetch or parse is retried on this many checks before it is given up on
+_FETCH_MAX_ATTEMPTS = 3
+# How many failed UIDs each client tracks for retries; the oldest are forgotten first
+_FAILED_UIDS_SIZE = 1000
+
+# Headers kept by the single-part fast path, by lowercased name; the rest of the header block is skipped
+_SIMPLE_HEADERS = {
+    name.lower(): name
+    for name in (
+        "From", "To", "Cc", "Subject", "Date", "Message-ID", "In-Reply-To", "References",
+        "Content-Type", "Content-Transfer-Encoding",
+    )
+}
+# Header names the email package accepts: printable ASCII other than the colon
+_HEADER_NAME_RE = re.compile(r"[\041-\071\073-\176]+")
+_CHARSET_PARAM_RE = re.compile(r';\s*charset\s*=\s*"?([^";\s]+)"?', re.IGNORECASE)
+# Transfer encodings get_payload(decode=True) decodes; every other value leaves the body bytes as they are
+_DECODED_TRANSFER_ENCODINGS = frozenset({"quoted-printable", "base64", "x-uuencode", "uuencode", "uue", "x-uue"})
+
+
+def _first_message_id(header: str) -> Optional[str]:
+    """
+    Return the first <message-id> in a header, without the angle brackets.
+
+    Args:
+        header: Header value such as References or In-Reply-To
+
+    Returns:
+        The message ID, or None if the header contains none
+    """
+    # A single search with the precompiled pattern scans the header in C, with no intermediate strings
+    match = _MSGID_RE.search(header)
+    return match.group(1) if match else None
+
+
+@functools.lru_cache(maxsize=4096)
+def _thread_id_from(references: str, in_reply_to: str, subject: str, sender: str) -> str:
+    """
+    Derive a thread ID from an email's threading headers.
+
+    Args:
+        references: References header value
+        in_reply_to: In-Reply-To header value
+        subject: Subject header value
+        sender: From header value
+
+    Returns:
+        Thread ID string
+    """
+    # First check References header for thread ID
+    if references:
+        # Use the first message ID in references as thread ID
+        message_id = _first_message_id(references)
+        if message_id:
+            return message_id
+
+    # If no References, try In-Reply-To
+    if in_reply_to:
+        message_id = _first_message_id(in_reply_to)
+        if message_id:
+            return message_id
+
+    # If no References or In-Reply-To, use subject + sender as thread ID
+    # Remove any Re:, Fw: or Fwd: prefixes from subject for thread ID consistency, including stacked ones
+    prefix = _SUBJECT_PREFIX_RE.match(subject, 0, _SUBJECT_PREFIX_SCAN_LIMIT)
+    clean_subject = subject[prefix.end() :] if prefix else subject
+    if not clean_subject:
+        clean_subject = "No Subject"
+
+    # Create a thread ID from cleaned subject and sender
+    from_addr = parseaddr(sender)[1]
+    return f"{clean_subject}_{from_addr}"
+
+
+def _decode_payload(payload: Any, charset: Optional[str]) -> str:
+    """
+    Decode a MIME part's payload to text.
+
+    Args:
+        payload: Payload returned by get_payload(decode=True)
+        charset: Charset declared for the part
+
+    Returns:
+        The decoded text; undecodable bytes are replaced with U+FFFD
+    """
+    if isinstance(payload, bytes):
+        return payload.decode(charset or "utf-8", errors="replace")
+    # Handle string or other payload types
+    return str(payload)
+
+
+class _MessageTemplate:
+    """
+    Reusable multipart/alternative message with a plain text and an HTML part.
+
+    Outgoing messages all share this structure, so the MIME objects are reset and
+    refilled for each send instead of being rebuilt.
+    """
+
+    # Headers set per message by EmailClient.send_email
+    _HEADERS = ("To", "Cc", "From", "Subject", "Date", "Message-ID", "In-Reply-To", "References")
+
+    def __init__(self) -> None:
+        self.msg = MIMEMultipart("alternative")
+        self.text_part = MIMEText("", "plain")
+        self.html_part = MIMEText("", "html")
+
+    def prepare(self, body_text: str, body_html: Optional[str] = None) -> MIMEMultipart:
+        """
+        Clear the previous message's headers and fill in new bodies.
+
+        Args:
+            body_text: Plain text email body
+            body_html: HTML email body (optional)
+
+        Returns:
+            The multipart message, ready for headers to be added
+        """
+        for header in self._HEADERS:
+            del self.msg[header]
+        # Drop the boundary chosen for the previous body so a fresh one is generated
+        self.msg.replace_header("Content-Type", "multipart/alternative")
+
+        self._set_body(self.text_part, body_text)
+        parts: List[Message] = [self.text_part]
+        if body_html:
+            self._set_body(self.html_part, body_html)
+            parts.append(self.html_part)
+        self.msg.set_payload(parts)
+        return self.msg
+
+    @staticmethod
+    def _set_body(part: MIMEText, body: str) -> None:
+        """Replace a text part's payload, encoding it the same way MIMEText would."""
+        try:
+            body.encode("us-ascii")
+            charset = "us-ascii"
+        except UnicodeEncodeError:
+            charset = "utf-8"
+
+        part.replace_header("Content-Type", f'{part.get_content_type()}; charset="{charset}"')
+        # set_payload only re-encodes the body when no transfer encoding is present
+        del part["Content-Transfer-Encoding"]
+        part.set_payload(body, _BODY_CHARSETS[charset])
+
+
+async def _quit_smtp(smtp: aiosmtplib.SMTP) -> None:
+    """
+    Close an SMTP connection, logging rather than raising on failure.
+
+    Args:
+        smtp: SMTP client to disconnect
+    """
+    try:
+        if smtp.is_connected:
+            await smtp.quit()
+            logger.info("Disconnected from SMTP server")
+    except Exception as e:
+        logger.error("Error during SMTP disconnect: %s", str(e))
+
+
+def _smtp_reply_code(error: BaseException) -> Optional[int]:
+    """
+    Return the reply code of an SMTP server rejection.
+
+    Args:
+        error: Exception raised while sending
+
+    Returns:
+        The reply code, the highest one if every recipient was refused, or None if the error isn't a rejection
+    """
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return error.code
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return max((refused.code for refused in error.recipients), default=None)
+    return None
+
+
+def _is_transient_smtp_error(error: BaseException) -> bool:
+    """
+    Tell whether a failed send is worth retrying.
+
+    Args:
+        error: Exception raised while sending
+
+    Returns:
+        True for 4xx replies, disconnects and timeouts; False for 5xx replies and anything else
+    """
+    code = _smtp_reply_code(error)
+    if code is not None:
+        return 400 <= code < 500
+    # SMTPServerDisconnected and SMTPConnectError are ConnectionErrors, SMTPTimeoutError is a TimeoutError
+    return isinstance(error, (OSError, TimeoutError))
+
+
+class _SmtpConnectionPool:
+    """
+    Bounded pool of authenticated SMTP connections.
+
+    Sends borrow a connection for one message and hand it back, so the TCP, TLS and AUTH handshakes are paid
+    once per connection rather than once per email, and up to max_connections emails go out concurrently.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[aiosmtplib.SMTP]],
+        max_connections: int = _SMTP_MAX_CONNECTIONS,
+    ) -> None:
+        self._connect = connect
+        self._slots = asyncio.Semaphore(max_connections)
+        # Idle connections as (client, messages sent, last used), the most recently used last
+        self._idle: List[Tuple[aiosmtplib.SMTP, int, float]] = []
+        # Bumped by close(), so connections lent out before it are closed when they come back
+        self._generation = 0
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Borrow a connection for sending one message.
+
+        A connection is kept when the server rejects the message, since sendmail resets the envelope afterwards.
+        After any other error, or a 421 closing the session, it is discarded, as it may be mid-transaction or dead.
+
+        Returns:
+            Connected and authenticated SMTP client
+        """
+        async with self._slots:
+            smtp, sent = await self._checkout()
+            generation = self._generation
+            try:
+                yield smtp
+            except BaseException as e:
+                if _smtp_reply_code(e) in (None, 421):
+                    await _quit_smtp(smtp)
+                else:
+                    await self._release(smtp, sent + 1, generation)
+                raise
+
+            await self._release(smtp, sent + 1, generation)
+
+    async def _release(self, smtp: aiosmtplib.SMTP, sent: int, generation: int) -> None:
+        """Return a connection to the idle list, or close it if it is used up, dead or from before close()."""
+        if sent >= _SMTP_MAX_MESSAGES_PER_CONNECTION:
+            logger.info("Recycling SMTP connection after %d messages", sent)
+            await _quit_smtp(smtp)
+        elif generation != self._generation or not smtp.is_connected:
+            await _quit_smtp(smtp)
+        else:
+            self._idle.append((smtp, sent, time.monotonic()))
+
+    async def _checkout(self) -> Tuple[aiosmtplib.SMTP, int]:
+        """Take the most recently used idle connection that still works, or open a new one."""
+        while self._idle:
+            smtp, sent, last_used = self._idle.pop()
+            if not smtp.is_connected:
+                continue
+            if time.monotonic() - last_used > _SMTP_IDLE_CHECK_AFTER:
+                # The server may have silently dropped a long-idle session; probe it before relying on it
+                try:
+                    await smtp.noop()
+                except Exception as e:
+                    logger.info("Idle SMTP connection is no longer usable, reconnecting: %s", str(e))
+                    await _quit_smtp(smtp)
+                    continue
+            return smtp, sent
+
+        return await self._connect(), 0
+
+    async def close(self) -> None:
+        """Close the idle connections; connections in use are closed when they are returned."""
+        self._generation += 1
+        idle, self._idle = self._idle, []
+        for smtp, _, _ in idle:
+            await _quit_smtp(smtp)
+
+
+def _parse_fetch_response(data: List[Any]) -> Dict[int, Dict[bytes, Any]]:
+    """
+    Collect an imaplib FETCH response into a dictionary keyed by UID.
+
+    Args:
+        data: Response data from a UID FETCH of (UID FLAGS BODY.PEEK[]) or (UID FLAGS)
+
+    Returns:
+        Mapping of UID to {b"FLAGS": tuple of flags, b"BODY[]": raw email}, without b"BODY[]" for flags-only fetches
+    """
+    # Each message comes back as an (envelope, raw_email) tuple followed by the bytes the server sent after the
+    # literal. That tail is usually just b")", but servers may put UID and FLAGS there instead of in the envelope.
+    # A flags-only fetch has no literal, so each message is a single bytes item.
+    responses: List[List[Any]] = []
+    for item in data:
+        if isinstance(item, tuple) and len(item) >= 2:
+            responses.append([item[0], item[1]])
+        elif isinstance(item, bytes) and _FETCH_START_RE.match(item):
+            responses.append([item, None])
+        elif isinstance(item, bytes) and responses:
+            responses[-1][0] += item
+        elif item is not None and item != b")":
+            # None means the UID range matched no messages
+            logger.error("Invalid data structure returned from IMAP server")
+
+    messages: Dict[int, Dict[bytes, Any]] = {}
+    for envelope, raw_email in responses:
+        # Envelope looks like b"1 (UID 42 FLAGS (\\Seen) BODY[] {1234}", or b"1 (BODY[] {1234} UID 42 FLAGS ())"
+        uid_match = _UID_RE.search(envelope)
+        if uid_match is None:
+            logger.error("No UID in IMAP fetch response: %s", envelope)
+            continue
+
+        flags_match = _FLAGS_RE.search(envelope)
+        message: Dict[bytes, Any] = {b"FLAGS": tuple(flags_match.group(1).split()) if flags_match else ()}
+        if raw_email is not None:
+            message[b"BODY[]"] = raw_email
+        messages[int(uid_match.group(1))] = message
+    return messages
+
+
+def _flatten_message(msg: Message) -> bytes:
+    """
+    Serialize a message to the CRLF-delimited bytes sent over SMTP.
+
+    Args:
+        msg: Email message to serialize
+
+    Returns:
+        The message as bytes
+    """
+    buffer = io.BytesIO()
+    BytesGenerator(buffer, mangle_from_=False, policy=_SMTP_POLICY).flatten(msg)
+    return buffer.getvalue()
 
 
 class EmailClient:
@@ -37,6 +433,8 @@ class EmailClient:
         username: str,
         password: str,
         mailbox: str = "INBOX",
+        fetch_batch_size: int = 100,
+        parallel_parse_threshold: int = 20,
     ) -> None:
         self.imap_server = imap_server
         self.imap_port = imap_port
@@ -46,7 +444,36 @@ class EmailClient:
         self.password = password
         self.mailbox = mailbox
         self.sender_email = sender_email
+        # Domain for generated Message-IDs, computed once rather than per send
+        self._msgid_domain = sender_email.split("@", 1)[1] if "@" in sender_email else sender_email
+        self.fetch_batch_size = fetch_batch_size
+        # Larger batches are parsed in a process pool; smaller ones don't amortize the worker startup cost
+        self.parallel_parse_threshold = parallel_parse_threshold
+        # Worker processes for large batches, started on first use and kept so later batches skip the startup
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_lock = threading.Lock()
         self._imap: Optional[imaplib.IMAP4_SSL] = None
+        # Highest UID already handled in this session; later checks only fetch UIDs above it
+        self._last_uid: Optional[int] = None
+        # Bounded, insertion-ordered record of handled Message-IDs; the oldest are forgotten first
+        self._seen_message_ids: "OrderedDict[str, None]" = OrderedDict()
+        # Attempts so far for each UID that failed to fetch or parse, bounded like _seen_message_ids
+        self._failed_uids: "OrderedDict[int, int]" = OrderedDict()
+        # IDLE state is shared with whichever thread calls idle_done(), so guard it with a lock
+        self._idle_lock = threading.Lock()
+        self._idle_tag: Optional[bytes] = None
+        self._idle_cancelled = False
+        self._smtp_pool = _SmtpConnectionPool(self._connect_smtp)
+        self._message_pool: Deque[_MessageTemplate] = deque(maxlen=16)
+
+    async def connect_imap(self) -> None:
+        """Connect to the IMAP server without blocking the event loop."""
+        # imaplib connects, negotiates TLS and logs in synchronously, which can take seconds
+        await asyncio.get_running_loop().run_in_executor(None, self._connect_imap)
+
+    async def disconnect_imap(self) -> None:
+        """Disconnect from the IMAP server without blocking the event loop."""
+        await asyncio.get_running_loop().run_in_executor(None, self._disconnect_imap)
 
     def _connect_imap(self) -> None:
         """Connect to the IMAP server and select the mailbox."""
@@ -57,6 +484,8 @@ class EmailClient:
             self._imap = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
             self._imap.login(self.username, self.password)
             self._imap.select(self.mailbox)
+            # A new session starts from an UNSEEN search again
+            self._last_uid = None
             logger.info("Connected to IMAP server %s", self.imap_server)
         except Exception as e:
             logger.error("Failed to connect to IMAP server: %s", str(e))
@@ -75,7 +504,128 @@ class EmailClient:
             finally:
                 self._imap = None
 
-    def _parse_email(self, raw_email: bytes) -> EmailDataDict:
+    def _imap_noop_refresh(self) -> None:
+        """Keep a reused IMAP connection alive, reconnecting if the server dropped it."""
+        if self._imap is None:
+            return
+
+        try:
+            self._imap.noop()
+        except (imaplib.IMAP4.abort, OSError) as e:
+            logger.warning("IMAP connection lost, reconnecting: %s", str(e))
+            self._imap = None
+            self._connect_imap()
+
+    def supports_idle(self) -> bool:
+        """Whether the current IMAP session advertises the IDLE extension (RFC 2177)."""
+        return self._imap is not None and "IDLE" in self._imap.capabilities
+
+    async def idle(self, timeout: float = _IDLE_TIMEOUT) -> bool:
+        """
+        Wait in IMAP IDLE until the server announces new mail.
+
+        Args:
+            timeout: Seconds to stay in IDLE before ending it
+
+        Returns:
+            True if the server reported new messages, False on timeout or idle_done()
+        """
+        return await asyncio.to_thread(self._idle, timeout)
+
+    def _idle(self, timeout: float) -> bool:
+        """Synchronous implementation of idle."""
+        self._connect_imap()
+        imap = self._imap
+        if imap is None:
+            logger.error("IMAP connection is not established")
+            return False
+
+        sock = imap.sock
+        previous_timeout = sock.gettimeout()
+        sock.settimeout(timeout + _IDLE_READ_GRACE)
+        try:
+            return self._idle_on(imap, timeout)
+        except TimeoutError as e:
+            logger.warning("No response from IMAP server during IDLE, dropping the connection")
+            # LOGOUT would only wait on the same dead socket, so close it without a goodbye
+            with contextlib.suppress(OSError):
+                imap.shutdown()
+            if self._imap is imap:
+                self._imap = None
+            raise imaplib.IMAP4.abort("IDLE timed out waiting for the server") from e
+        finally:
+            with contextlib.suppress(OSError):
+                sock.settimeout(previous_timeout)
+
+    def _idle_on(self, imap: imaplib.IMAP4_SSL, timeout: float) -> bool:
+        """
+        Run one IDLE command on an open connection.
+
+        Args:
+            imap: IMAP connection with the mailbox selected
+            timeout: Seconds to stay in IDLE before ending it
+
+        Returns:
+            True if the server reported new messages, False on timeout or idle_done()
+        """
+        tag = imap._new_tag()
+        imap.send(tag + b" IDLE\r\n")
+        response = imap.readline()
+        if not response.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE rejected: {response!r}")
+
+        with self._idle_lock:
+            self._idle_tag = tag
+            cancelled, self._idle_cancelled = self._idle_cancelled, False
+        if cancelled:
+            self.idle_done()
+
+        timer = threading.Timer(timeout, self.idle_done)
+        timer.daemon = True
+        timer.start()
+        got_mail = False
+        try:
+            # Read untagged updates until the server confirms DONE with the tagged response
+            while True:
+                line = imap.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                if line.startswith(tag + b" "):
+                    if not line.startswith(tag + b" OK"):
+                        raise imaplib.IMAP4.error(f"IDLE failed: {line!r}")
+                    return got_mail
+                if line.rstrip().upper().endswith(b" EXISTS"):
+                    got_mail = True
+                    self.idle_done()
+        finally:
+            timer.cancel()
+            with self._idle_lock:
+                self._idle_tag = None
+
+    def idle_done(self) -> None:
+        """
+        End an ongoing IDLE. Safe to call from any thread.
+
+        If no IDLE is active, the next one ends as soon as the server acknowledges it, unless reset_idle() is called
+        first.
+        """
+        with self._idle_lock:
+            if self._idle_tag is None:
+                self._idle_cancelled = True
+                return
+            self._idle_tag = None
+            imap = self._imap
+
+        if imap is not None:
+            imap.send(b"DONE\r\n")
+
+    def reset_idle(self) -> None:
+        """Forget an idle_done() that arrived while no IDLE was active, so the next IDLE runs normally."""
+        with self._idle_lock:
+            self._idle_cancelled = False
+
+    @staticmethod
+    def _parse_email(raw_email: bytes) -> EmailDataDict:
         """
         Parse raw email data into a structured dictionary.
 
@@ -85,132 +635,270 @@ class EmailClient:
         Returns:
             Dictionary containing parsed email fields
         """
+        cache_key = hashlib.blake2b(raw_email, digest_size=16).digest()
+        with _parse_cache_lock:
+            cached = _parse_cache.get(cache_key)
+            if cached is not None:
+                _parse_cache.move_to_end(cache_key)
+                return dict(cached)
+
         try:
-            msg = email.message_from_bytes(raw_email)
-
-            # Extract basic headers
-            email_data: EmailDataDict = {
-                "message_id": msg.get("Message-ID", "").strip("<>"),
-                "in_reply_to": msg.get("In-Reply-To", "").strip("<>"),
-                "references": msg.get("References", ""),
-                "subject": msg.get("Subject", ""),
-                "date": msg.get("Date", ""),
-                "sender": parseaddr(msg.get("From", ""))[1],
-                "recipients": [parseaddr(to)[1] for to in msg.get("To", "").split(",") if to],
-                "cc": [parseaddr(cc)[1] for cc in msg.get("Cc", "").split(",") if cc],
-            }
+            # Most mail is a single text part, which doesn't need the full MIME tree
+            email_data = EmailClient._parse_simple_email(raw_email)
+            if email_data is None:
+                msg = email.message_from_bytes(raw_email)
+                body_text, body_html = EmailClient._extract_bodies(msg)
+                email_data = {
+                    **EmailClient._header_fields(msg),
+                    "body_text": body_text,
+                    "body_html": body_html,
+                }
+
+            with _parse_cache_lock:
+                _parse_cache[cache_key] = email_data
+                if len(_parse_cache) > _PARSE_CACHE_SIZE:
+                    _parse_cache.popitem(last=False)
+            # Hand out copies so callers can't modify the cached entry
+            return dict(email_data)
+        except Exception as e:
+            logger.error("Error parsing email: %s", str(e))
+            raise
+
+    @staticmethod
+    def _parse_simple_email(raw_email: bytes) -> Optional[EmailDataDict]:
+        """
+        Parse a single-part text email by scanning its header block directly.
+
+        Only the headers _header_fields reads are kept, with the values the email package would return, and the
+        body bytes are used as the payload. Messages the scan can't reproduce exactly (multipart or
+        transfer-encoded bodies, non-ASCII or malformed header lines, bare LF line endings) return None.
+
+        Args:
+            raw_email: Raw email data from IMAP server
+
+        Returns:
+            Dictionary containing parsed email fields, or None if the message needs the full parser
+        """
+        header_block, separator, body = raw_email.partition(b"\r\n\r\n")
+        if not separator or not header_block.isascii():
+            return None
+
+        headers: Dict[str, str] = {}
+        lines = header_block.decode("ascii").split("\r\n")
+        if lines[0][:1] in (" ", "\t"):
+            return None
+        # Name of the kept header whose continuation lines are being collected, if any
+        current: Optional[str] = None
+        for line in lines:
+            if "\r" in line or "\n" in line:
+                return None
+            if line[:1] in (" ", "\t"):
+                # Folded header: the email package keeps the line break and indentation in the value
+                if current is not None:
+                    headers[current] += "\r\n" + line
+                continue
+            name, colon, value = line.partition(":")
+            if not colon or not _HEADER_NAME_RE.fullmatch(name):
+                return None
+            current = _SIMPLE_HEADERS.get(name.lower())
+            # Like Message.get, the first occurrence of a header wins
+            if current is not None and current in headers:
+                current = None
+            if current is not None:
+                headers[current] = value.lstrip(" \t")
+
+        content_type_header = headers.get("Content-Type", "")
+        content_type = content_type_header.partition(";")[0].strip().lower() or "text/plain"
+        if content_type.count("/") != 1:
+            content_type = "text/plain"
+        if content_type != "text/plain" and content_type != "text/html":
+            return None
+        if headers.get("Content-Transfer-Encoding", "").lower() in _DECODED_TRANSFER_ENCODINGS:
+            return None
+        params = content_type_header.partition(";")[2]
+        if "*" in params or "(" in params:
+            # RFC 2231 parameters and comments need the full parameter parser
+            return None
+        charset_match = _CHARSET_PARAM_RE.search(content_type_header)
+        text = _decode_payload(body, charset_match.group(1).lower() if charset_match else "utf-8")
+
+        return {
+            **EmailClient._header_fields(headers),
+            "body_text": text if content_type == "text/plain" else "",
+            "body_html": text if content_type == "text/html" else "",
+        }
+
+    @staticmethod
+    def _header_fields(msg: Union[Message, Dict[str, str]]) -> EmailDataDict:
+        """
+        Extract the header fields of an email message.
+
+        Args:
+            msg: Email message, or its headers keyed by canonical name
 
+        Returns:
+            Dictionary containing the parsed header fields
+        """
+        # Build the result in one go rather than growing the dict key by key
+        return {
+            "message_id": msg.get("Message-ID", "").strip("<>"),
+            "in_reply_to": msg.get("In-Reply-To", "").strip("<>"),
+            "references": msg.get("References", ""),
+            "subject": msg.get("Subject", ""),
+            "date": msg.get("Date", ""),
+            "sender": getaddresses([msg.get("From", "")])[0][1],
+            # getaddresses respects quoted display names such as "Doe, John" <john@example.com>
+            "recipients": [addr for _, addr in getaddresses([msg.get("To", "")]) if addr],
+            "cc": [addr for _, addr in getaddresses([msg.get("Cc", "")]) if addr],
             # Extract thread ID from References or generate from subject
-            email_data["thread_id"] = self._extract_thread_id(msg)
+            "thread_id": EmailClient._extract_thread_id(msg),
+        }
 
-            # Extract body
-            email_data["body_text"] = ""
-            email_data["body_html"] = ""
+    @staticmethod
+    def _extract_bodies(msg: Message) -> Tuple[str, str]:
+        """
+        Extract the plain text and HTML bodies of an email message.
 
-            # Find the body parts - simplified approach
-            if msg.is_multipart():
-                for part in msg.walk():
-                    content_type = part.get_content_type()
-                    content_disposition = str(part.get("Content-Disposition", ""))
+        Args:
+            msg: Email message
 
-                    # Skip attachments
-                    if "attachment" in content_disposition:
-                        continue
+        Returns:
+            Tuple of (body_text, body_html), empty strings where a body is missing
+        """
+        body_text = ""
+        body_html = ""
+
+        # Find the body parts - simplified approach
+        if msg.is_multipart():
+            found_text = False
+            found_html = False
+            parts: Iterable[Message] = msg.walk()
+            if msg.get_content_type() == "multipart/alternative":
+                # The common text + html case has flat parts, so index them directly instead of walking the tree
+                payload_parts = msg.get_payload()
+                if not any(part.is_multipart() for part in payload_parts):
+                    parts = payload_parts
+            for part in parts:
+                content_type = part.get_content_type()
+                if content_type != "text/plain" and content_type != "text/html":
+                    continue
 
-                    payload = part.get_payload(decode=True)
-                    if payload is None:
-                        continue
+                # Skip attachments
+                content_disposition = str(part.get("Content-Disposition", ""))
+                if "attachment" in content_disposition:
+                    continue
 
-                    try:
-                        charset = part.get_content_charset("utf-8")
-                        if isinstance(payload, bytes):
-                            decoded_payload = payload.decode(charset)
-                        else:
-                            decoded_payload = str(payload)
-                    except UnicodeDecodeError:
-                        # Fallback to latin-1 if UTF-8 fails
-                        if isinstance(payload, bytes):
-                            decoded_payload = payload.decode("latin-1")
-                        else:
-                            decoded_payload = str(payload)
-
-                    if content_type == "text/plain":
-                        email_data["body_text"] = decoded_payload
-                    elif content_type == "text/html":
-                        email_data["body_html"] = decoded_payload
-            else:
-                payload = msg.get_payload(decode=True)
+                payload = part.get_payload(decode=True)
                 if payload is None:
-                    pass
-                elif isinstance(payload, bytes):
-                    try:
-                        charset = msg.get_content_charset("utf-8")
-                        decoded_payload = payload.decode(charset)
-                    except UnicodeDecodeError:
-                        # Fallback to latin-1 if UTF-8 fails
-                        decoded_payload = payload.decode("latin-1")
-
-                    if msg.get_content_type() == "text/plain":
-                        email_data["body_text"] = decoded_payload
-                    elif msg.get_content_type() == "text/html":
-                        email_data["body_html"] = decoded_payload
-                else:
-                    # Handle string or other payload types
-                    decoded_payload = str(payload)
-                    if msg.get_content_type() == "text/plain":
-                        email_data["body_text"] = decoded_payload
-                    elif msg.get_content_type() == "text/html":
-                        email_data["body_html"] = decoded_payload
-
-            return email_data
-        except Exception as e:
-            logger.error("Error parsing email: %s", str(e))
-            raise
+                    continue
+
+                decoded_payload = _decode_payload(payload, part.get_content_charset("utf-8"))
 
-    def _extract_thread_id(self, msg: Message) -> str:
+                if content_type == "text/plain":
+                    body_text = decoded_payload
+                    found_text = True
+                elif content_type == "text/html":
+                    body_html = decoded_payload
+                    found_html = True
+
+                # Stop walking once both bodies are found; remaining parts are usually attachments
+                if found_text and found_html:
+                    break
+        else:
+            content_type = msg.get_content_type()
+            payload = msg.get_payload(decode=True)
+            if payload is not None:
+                decoded_payload = _decode_payload(payload, msg.get_content_charset("utf-8"))
+                if content_type == "text/plain":
+                    body_text = decoded_payload
+                elif content_type == "text/html":
+                    body_html = decoded_payload
+
+        return body_text, body_html
+
+    @staticmethod
+    def _parse_email_or_none(raw_email: bytes) -> Optional[EmailDataDict]:
         """
-        Extract a thread ID from an email message.
+        Parse raw email data, returning None instead of raising on failure.
 
         Args:
-            msg: Email message
+            raw_email: Raw email data from IMAP server
 
         Returns:
-            Thread ID string
+            Dictionary containing parsed email fields, or None if parsing failed
         """
-        # First check References header for thread ID
-        references = msg.get("References", "")
-        if references:
-            # Use the first message ID in references as thread ID
-            message_ids = re.findall(r"<([^<>]+)>", references)
-            if message_ids:
-                return message_ids[0]
+        try:
+            return EmailClient._parse_email(raw_email)
+        except Exception:
+            return None
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Return the parse worker pool, starting it if needed."""
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # This runs on an IMAP worker thread, and forking a multi-threaded process can deadlock the child
+                self._parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_PARSE_MP_CONTEXT)
+            return self._parse_pool
+
+    def _parse_emails(self, raw_emails: List[bytes]) -> List[Optional[EmailDataDict]]:
+        """
+        Parse a batch of raw emails, using a process pool for large batches.
 
-        # If no References, try In-Reply-To
-        in_reply_to = msg.get("In-Reply-To", "")
-        if in_reply_to:
-            message_id = re.search(r"<([^<>]+)>", in_reply_to)
-            if message_id:
-                return message_id.group(1)
+        Args:
+            raw_emails: Raw email data from IMAP server
 
-        # If no References or In-Reply-To, use subject + sender as thread ID
-        subject = msg.get("Subject", "")
-        # Remove any Re: or Fwd: prefixes from subject for thread ID consistency
-        clean_subject = re.sub(r"(?i)^(re|fwd)(\[\d+\])?:\s*", "", subject)
-        if not clean_subject:
-            clean_subject = "No Subject"
+        Returns:
+            Parsed email data in the same order, with None for emails that failed to parse
+        """
+        if len(raw_emails) > self.parallel_parse_threshold:
+            # MIME parsing is pure-Python CPU work, so worker processes sidestep the GIL
+            return list(self._get_parse_pool().map(EmailClient._parse_email_or_none, raw_emails, chunksize=8))
 
-        # Create a thread ID from cleaned subject and sender
-        from_addr = parseaddr(msg.get("From", ""))[1]
-        return f"{clean_subject}_{from_addr}"
+        parsed: List[Optional[EmailDataDict]] = []
+        for raw_email in raw_emails:
+            try:
+                parsed.append(self._parse_email(raw_email))
+            except Exception as e:
+                logger.error(f"Error processing email: {str(e)}")
+                parsed.append(None)
+        return parsed
 
-    def check_new_emails(self) -> List[EmailDataDict]:
+    @staticmethod
+    def _extract_thread_id(msg: Union[Message, Dict[str, str]]) -> str:
+        """
+        Extract a thread ID from an email message.
+
+        Args:
+            msg: Email message, or its headers keyed by canonical name
+
+        Returns:
+            Thread ID string
+        """
+        # Replies in a thread repeat the same headers, so the derivation is memoized on their values. Headers with
+        # raw 8-bit bytes come back as unhashable Header objects, so every value is made a str first.
+        return _thread_id_from(
+            str(msg.get("References", "")),
+            str(msg.get("In-Reply-To", "")),
+            str(msg.get("Subject", "")),
+            str(msg.get("From", "")),
+        )
+
+    async def check_new_emails(self) -> List[EmailDataDict]:
         """
         Check for new unseen emails in the mailbox.
 
         Returns:
             List of parsed email messages
         """
+        # imaplib is blocking, so the IMAP session runs in a worker thread to keep the event loop responsive
+        return await asyncio.to_thread(self._check_new_emails)
+
+    def _check_new_emails(self) -> List[EmailDataDict]:
+        """Synchronous implementation of check_new_emails."""
         try:
+            # The connection is kept open between checks; make sure a reused one is still alive
+            if self._imap is not None:
+                self._imap_noop_refresh()
             self._connect_imap()
 
             # After connecting, self._imap should not be None, but check to make the linter happy
@@ -218,54 +906,183 @@ class EmailClient:
                 logger.error("IMAP connection is not established")
                 return []
 
-            # Search for all unseen emails
-            result, message_ids = self._imap.search(None, "UNSEEN")
-            if result != "OK":
-                logger.error("Failed to search for unseen emails")
-                return []
-
-            message_id_list = message_ids[0].split()
-            if not message_id_list:
-                return []
+            last_uid = self._last_uid
+            failed_uids = self._failed_uids
+            imap_uid = self._imap.uid
+            if last_uid is None:
+                # UIDNEXT from SELECT predates the search, so mail arriving in between is picked up next time
+                next_uid = self._uid_next()
+
+                # Search for all unseen emails by UID, which stays stable across sessions unlike sequence numbers
+                result, message_ids = imap_uid("SEARCH", None, "UNSEEN")
+                if result != "OK":
+                    logger.error("Failed to search for unseen emails")
+                    return []
+
+                unseen_uids = [int(uid) for uid in message_ids[0].split()]
+                if next_uid is not None:
+                    high_water = next_uid - 1
+                else:
+                    # Every unseen message is fetched below, so later checks can carry on from the newest of them
+                    logger.warning("Server did not report UIDNEXT for %s, using the newest unseen UID", self.mailbox)
+                    high_water = max(unseen_uids, default=None)
+            else:
+                # Everything up to the high-water mark has been handled, so one flags-only FETCH finds any new mail
+                result, data = imap_uid("FETCH", f"{last_uid + 1}:*", _FLAGS_FETCH_ITEMS)
+                if result != "OK":
+                    logger.error("Failed to fetch flags of emails after UID %s", last_uid)
+                    return []
+
+                # "N:*" always matches the newest message, even when it is below N
+                new_messages = {uid: message for uid, message in _parse_fetch_response(data).items() if uid > last_uid}
+                high_water = max(new_messages, default=last_uid)
+                unseen_uids = [uid for uid, message in new_messages.items() if b"\\Seen" not in message[b"FLAGS"]]
+
+            # The high-water mark moves past failed messages too; they are retried from _failed_uids instead
+            if high_water is not None:
+                self._last_uid = high_water
+            fetch_uids = [
+                uid for uid in sorted(failed_uids.keys() | unseen_uids) if failed_uids.get(uid, 0) < _FETCH_MAX_ATTEMPTS
+            ]
+
+            # Fetch bodies in batches so N unseen messages cost N / fetch_batch_size round-trips, and parse each batch
+            # on a background thread while the next one is read off the socket
+            fetched_uids: List[str] = []
+            parsed_emails: List[Optional[EmailDataDict]] = []
+            uid_iter = iter(fetch_uids)
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-parse") as parse_executor:
+                pending: List["Future[List[Optional[EmailDataDict]]]"] = []
+                while batch := list(islice(uid_iter, self.fetch_batch_size)):
+                    uid_set = ",".join(map(str, batch))
+                    result, data = imap_uid("FETCH", uid_set, _FETCH_ITEMS)
+                    if result != "OK" or not data:
+                        logger.error("Failed to fetch emails with UIDs %s", uid_set)
+                        messages = {}
+                    else:
+                        messages = _parse_fetch_response(data)
+
+                    raw_emails: List[bytes] = []
+                    for uid in batch:
+                        raw_email = messages.get(uid, {}).get(b"BODY[]")
+                        if raw_email is None:
+                            self._record_failed_uid(uid)
+                            continue
+                        fetched_uids.append(str(uid))
+                        raw_emails.append(raw_email)
+                    if raw_emails:
+                        pending.append(parse_executor.submit(self._parse_emails, raw_emails))
+
+                for future in pending:
+                    parsed_emails.extend(future.result())
 
             emails: List[EmailDataDict] = []
-            for message_id in message_id_list:
-                # The IMAP connection should remain established throughout this loop
-                result, data = self._imap.fetch(message_id, "(RFC822)")
-                if result != "OK" or not data:
-                    logger.error("Failed to fetch email with ID %s", message_id)
-                    continue
-
-                # Ensure we have valid data before indexing
-                if not data or not isinstance(data[0], tuple) or len(data[0]) < 2:
-                    logger.error("Invalid data structure returned from IMAP server")
+            seen_uids: List[str] = []
+            # Bind what the loop touches per email to locals, saving an attribute lookup on each use
+            sender_email = self.sender_email
+            seen_message_ids = self._seen_message_ids
+            add_seen_uid = seen_uids.append
+            for uid, email_data in zip(fetched_uids, parsed_emails):
+                if email_data is None:
+                    self._record_failed_uid(int(uid))
                     continue
+                failed_uids.pop(int(uid), None)
 
-                raw_email = data[0][1]
-                # Process the raw email data - we know it must be bytes at this point
                 try:
-                    # Skip the unnecessary isinstance check since we know the type
-                    email_data = self._parse_email(raw_email)
-
                     # Skip emails sent by our own email address
-                    if email_data["sender"] == self.sender_email:
-                        logger.info(f"Skipping email sent by our own address: {self.sender_email}")
+                    if email_data["sender"] == sender_email:
+                        logger.info(f"Skipping email sent by our own address: {sender_email}")
                         # Mark as seen so we don't process it again
-                        self._imap.store(message_id, '+FLAGS', '\\Seen')
+                        add_seen_uid(uid)
                         continue
 
+                    # Skip emails already handled, e.g. re-fetched after a reconnect raced the \Seen flag update
+                    message_id = email_data.get("message_id")
+                    if message_id:
+                        if message_id in seen_message_ids:
+                            logger.info("Skipping already processed email %s", message_id)
+                            add_seen_uid(uid)
+                            continue
+                        seen_message_ids[message_id] = None
+                        if len(seen_message_ids) > _SEEN_MESSAGE_IDS_SIZE:
+                            seen_message_ids.popitem(last=False)
+
                     emails.append(email_data)
-                    # After processing each email
-                    self._imap.store(message_id, '+FLAGS', '\\Seen')
+                    add_seen_uid(uid)
                 except Exception as e:
                     logger.error(f"Error processing email: {str(e)}")
 
+            self._mark_seen(seen_uids)
             return emails
         except Exception as e:
             logger.error("Error checking for new emails: %s", str(e))
-            return []
-        finally:
+            # Drop the connection so the next check starts from a clean session
             self._disconnect_imap()
+            return []
+
+    def _record_failed_uid(self, uid: int) -> None:
+        """
+        Count a failed attempt to fetch or parse an email, so later checks retry it up to _FETCH_MAX_ATTEMPTS times.
+
+        Args:
+            uid: UID of the email
+        """
+        attempts = self._failed_uids.pop(uid, 0) + 1
+        # Given-up UIDs stay recorded, so the UNSEEN search after a reconnect doesn't start their attempts over
+        self._failed_uids[uid] = attempts
+        if attempts >= _FETCH_MAX_ATTEMPTS:
+            logger.error("Giving up on email with UID %s after %d failed attempts", uid, attempts)
+        if len(self._failed_uids) > _FAILED_UIDS_SIZE:
+            self._failed_uids.popitem(last=False)
+
+    def _mark_seen(self, uids: List[str]) -> None:
+        """
+        Flag emails as seen, with one UID STORE per batch of fetch_batch_size UIDs.
+
+        Args:
+            uids: UIDs of the emails to flag
+        """
+        if self._imap is None:
+            return
+
+        uid_iter = iter(uids)
+        while batch := list(islice(uid_iter, self.fetch_batch_size)):
+            uid_set = ",".join(batch)
+            try:
+                result, _ = self._imap.uid("STORE", uid_set, '+FLAGS', '\\Seen')
+                if result != "OK":
+                    logger.error("Failed to mark emails with UIDs %s as seen", uid_set)
+            except Exception as e:
+                # The emails were already handled, so report the failure without discarding them
+                logger.error("Failed to mark emails with UIDs %s as seen: %s", uid_set, str(e))
+
+    def _uid_next(self) -> Optional[int]:
+        """
+        Take the UID the next message in the mailbox will get, as reported when it was selected.
+
+        SELECT answers with an untagged "OK [UIDNEXT n]", which imaplib files under the response code's name.
+        Asking with STATUS instead is discouraged for the selected mailbox (RFC 3501, section 6.3.10).
+
+        Returns:
+            The UIDNEXT value, or None if the server did not report it or it was already taken
+        """
+        if self._imap is None:
+            return None
+
+        _, data = self._imap.response("UIDNEXT")
+        return int(data[-1]) if data and data[-1] else None
+
+    async def close(self) -> None:
+        """Close the pooled SMTP connections and stop the parse workers; both are recreated on demand."""
+        await self._smtp_pool.close()
+        with self._parse_pool_lock:
+            parse_pool, self._parse_pool = self._parse_pool, None
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def aclose(self) -> None:
+        """Close any open server connections."""
+        await self.disconnect_imap()
+        await self.close()
 
     async def send_email(
         self,
@@ -292,8 +1109,50 @@ class EmailClient:
         Returns:
             Tuple of (success, message_id)
         """
-        # Create a multipart message
-        msg = MIMEMultipart("alternative")
+        # Reuse a pooled multipart message rather than building a new MIME tree per send
+        template = self._message_pool.popleft() if self._message_pool else _MessageTemplate()
+        try:
+            msg, envelope = self._build_message(
+                template, recipients, subject, body_text, body_html, cc, in_reply_to, references
+            )
+
+            # Send the email
+            try:
+                return await self._send_smtp(msg, envelope)
+            except Exception as e:
+                logger.error("Failed to send email: %s", str(e))
+                return False, ""
+        finally:
+            self._message_pool.append(template)
+
+    def _build_message(
+        self,
+        template: _MessageTemplate,
+        recipients: Union[str, List[str]],
+        subject: str,
+        body_text: str,
+        body_html: Optional[str] = None,
+        cc: Optional[Union[str, List[str]]] = None,
+        in_reply_to: Optional[str] = None,
+        references: Optional[str] = None,
+    ) -> Tuple[MIMEMultipart, List[str]]:
+        """
+        Fill a pooled message template with an email's headers and bodies.
+
+        Args:
+            template: Message template to fill
+            recipients: Email recipient(s)
+            subject: Email subject
+            body_text: Plain text email body
+            body_html: HTML email body (optional)
+            cc: Carbon copy recipient(s) (optional)
+            in_reply_to: Message ID this email is replying to (optional)
+            references: Thread message ID references (optional)
+
+        Returns:
+            Tuple of (message, envelope recipients)
+        """
+        msg = template.prepare(body_text, body_html)
 
         # Add recipients
         if isinstance(recipients, str):
@@ -313,42 +1172,28 @@ class EmailClient:
         msg["Date"] = formatdate(localtime=True)
 
         # Generate a message ID
-        msg_id = make_msgid(domain=self.sender_email.split("@")[1])
+        msg_id = make_msgid(domain=self._msgid_domain)
         msg["Message-ID"] = msg_id
 
         # Add In-Reply-To and References headers for threading
         if in_reply_to:
-            msg["In-Reply-To"] = f"<{in_reply_to}>"
+            in_reply_to = f"<{in_reply_to.strip('<>')}>"
+            msg["In-Reply-To"] = in_reply_to
 
-            # Update References with in_reply_to if not already in references
+            # Update References with in_reply_to if it isn't one of its message IDs; comparing whole IDs rather
+            # than substrings keeps <msg-1> from being mistaken for part of <msg-12>
             if references:
-                if in_reply_to not in references:
-                    msg["References"] = f"{references} <{in_reply_to}>"
+                if in_reply_to[1:-1] not in set(_MSGID_RE.findall(references)):
+                    msg["References"] = f"{references} {in_reply_to}"
                 else:
                     msg["References"] = references
             else:
-                msg["References"] = f"<{in_reply_to}>"
+                msg["References"] = in_reply_to
         elif references:
             msg["References"] = references
 
-        # Add text part
-        msg.attach(MIMEText(body_text, "plain"))
-
-        # Add HTML part if provided
-        if body_html:
-            msg.attach(MIMEText(body_html, "html"))
-
-        # Send the email
-        try:
-            return await self._send_smtp(msg, recipients + cc)
-        except Exception as e:
-            logger.error("Failed to send email: %s", str(e))
-            return False, ""
+        return msg, recipients + cc
 
-    @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-        stop=stop_after_attempt(5),
-    )
     async def _send_smtp(self, msg: MIMEMultipart, recipients: List[str]) -> Tuple[bool, str]:
         """
         Send an email message via SMTP with retries.
@@ -360,23 +1205,77 @@ class EmailClient:
         Returns:
             Tuple of (success, message_id)
         """
+        # Serialize once up front so the message is not re-generated by the SMTP client
+        raw_message = _flatten_message(msg)
+        return await self._send_raw(raw_message, recipients, (msg["Message-ID"] or "").strip("<>"))
+
+    async def _send_raw(self, raw_message: bytes, recipients: List[str], message_id: str) -> Tuple[bool, str]:
+        """
+        Send a serialized email via SMTP, retrying transient failures.
+
+        Args:
+            raw_message: Email message as bytes
+            recipients: List of recipient email addresses
+            message_id: Message ID of the email, without angle brackets
+
+        Returns:
+            Tuple of (success, message_id)
+        """
+        for attempt in range(_SMTP_MAX_ATTEMPTS):
+            if attempt:
+                # Exponential backoff between attempts: 2s, 2s, 4s, 8s, ... capped at the max wait
+                await asyncio.sleep(min(_SMTP_RETRY_MAX_WAIT, max(_SMTP_RETRY_MIN_WAIT, 2 ** (attempt - 1))))
+
+            try:
+                async with self._smtp_pool.acquire() as smtp:
+                    await smtp.sendmail(self.sender_email, recipients, raw_message)
+                return True, message_id
+            except Exception as e:
+                if not _is_transient_smtp_error(e):
+                    # A permanent rejection fails the same way on every attempt
+                    logger.error("Failed to send email, not retrying: %s", str(e))
+                    return False, ""
+                logger.error("Failed to send email (attempt %d of %d): %s", attempt + 1, _SMTP_MAX_ATTEMPTS, str(e))
+
+        return False, ""
+
+    async def _connect_smtp(self) -> aiosmtplib.SMTP:
+        """Open a new connected and authenticated SMTP client for the connection pool."""
+        smtp = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port, start_tls=False)
         try:
-            smtp = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port)
             await smtp.connect()
+            # Upgrade with STARTTLS once per connection; every later send reuses the encrypted session
+            await smtp.ehlo()
+            if smtp.supports_extension("starttls"):
+                await smtp.starttls()
             await smtp.login(self.username, self.password)
+        except BaseException:
+            await _quit_smtp(smtp)
+            raise
+        logger.info("Connected to SMTP server %s", self.smtp_server)
+        return smtp
 
-            # Send the message
-            await smtp.send_message(msg)
-            await smtp.quit()
 
-            # Return success with the message ID
-            message_id = msg["Message-ID"]
-            if message_id:
-                return True, message_id.strip("<>")
-            return True, ""
-        except Exception as e:
-            logger.error("Failed to send email: %s", str(e))
-            return False, ""
+def single_email_adapter(callback: AsyncCallbackT) -> AsyncBatchCallbackT:
+    """
+    Adapt a callback that handles one email at a time to the batch callback contract.
+
+    Args:
+        callback: Function to call with each new email's data
+
+    Returns:
+        Batch callback that calls the wrapped callback for every email in the batch
+    """
+
+    @functools.wraps(callback)
+    async def batch_callback(new_emails: List[EmailDataDict]) -> None:
+        # Emails are independent, so handle them concurrently and report failures individually
+        results = await asyncio.gather(*(callback(email_data) for email_data in new_emails), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error("Error in email callback: %s", str(result))
+
+    return batch_callback
 
 
 class EmailMonitor:
@@ -388,38 +1287,106 @@ class EmailMonitor:
         self,
         email_client: EmailClient,
         check_interval: int = 60,
+        parallel_callbacks: bool = True,
+        use_idle: bool = True,
+        run_in_thread: bool = False,
     ) -> None:
         self.email_client = email_client
         self.check_interval = check_interval
+        self.parallel_callbacks = parallel_callbacks
+        # Wait for new mail with IMAP IDLE when the server supports it; check_interval is the polling fallback
+        self.use_idle = use_idle
+        # Optionally poll from a dedicated thread and event loop, so IMAP work can't add jitter to the app's loop
+        self.run_in_thread = run_in_thread
         self._running = False
         self._task: Optional[asyncio.Task[None]] = None
-        self._new_email_callbacks: List[AsyncCallbackT] = []
-
-    def register_callback(self, callback: AsyncCallbackT) -> None:
+        self._thread: Optional[threading.Thread] = None
+        self._monitor_loop: Optional[asyncio.AbstractEventLoop] = None
+        # The application's loop, where callbacks run when monitoring happens in a dedicated thread
+        self._app_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event = asyncio.Event()
+        # Used as an insertion-ordered set: registering is O(1) and idempotent, and sequential dispatch keeps its order
+        self._new_email_callbacks: Dict[AsyncBatchCallbackT, None] = {}
+
+    def register_callback(self, callback: AsyncBatchCallbackT) -> None:
         """
         Register a callback function to be called when new emails are received.
 
+        Callbacks receive every new email from one check in a single call, so handlers with fixed per-call
+        costs (a transaction, an HTTP round-trip) pay them once per check. Wrap callbacks that handle one
+        email at a time with single_email_adapter.
+
+        Args:
+            callback: Function to call with the list of new email data
+        """
+        self._new_email_callbacks[callback] = None
+
+    async def _dispatch(self, new_emails: List[EmailDataDict]) -> None:
+        """
+        Pass new emails to every registered callback.
+
+        Args:
+            new_emails: Parsed emails to dispatch
+        """
+        if self._app_loop is not None:
+            # Callbacks touch application state, so hand them over to the application's loop
+            future = asyncio.run_coroutine_threadsafe(self._run_callbacks(new_emails), self._app_loop)
+            await asyncio.wrap_future(future)
+        else:
+            await self._run_callbacks(new_emails)
+
+    async def _run_callbacks(self, new_emails: List[EmailDataDict]) -> None:
+        """
+        Call every registered callback with a batch of new emails.
+
         Args:
-            callback: Function to call with the new email data
+            new_emails: Parsed emails to pass to the callbacks
         """
-        self._new_email_callbacks.append(callback)
+        if not self.parallel_callbacks:
+            for callback in self._new_email_callbacks:
+                await callback(new_emails)
+            return
+
+        # Callbacks are independent, so run them concurrently and report failures individually
+        results = await asyncio.gather(
+            *(callback(new_emails) for callback in self._new_email_callbacks),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error("Error in email callback: %s", str(result))
+
+    async def _check_once(self) -> None:
+        """Run a single check for new emails and dispatch any that were found."""
+        try:
+            new_emails = await self.email_client.check_new_emails()
+            if new_emails:
+                logger.info("Found %d new emails", len(new_emails))
+                await self._dispatch(new_emails)
+        except Exception as e:
+            logger.error("Error in email monitoring: %s", str(e))
 
     async def _check_emails(self) -> None:
         """Check for new emails and process them."""
         while self._running:
+            await self._check_once()
+
+            if self.use_idle and self.email_client.supports_idle():
+                # Block until the server pushes new mail instead of polling; stop() ends the IDLE
+                try:
+                    await self.email_client.idle()
+                    continue
+                except Exception as e:
+                    logger.error("Error during IMAP IDLE: %s", str(e))
+
+            # An idle_done() that came while polling must not cut short a later IDLE
+            self.email_client.reset_idle()
+            # Wait until the next check, returning immediately if stop() is called
             try:
-                new_emails = self.email_client.check_new_emails()
-                if new_emails:
-                    logger.info("Found %d new emails", len(new_emails))
-                    for email_data in new_emails:
-                        for callback in self._new_email_callbacks:
-                            await callback(email_data)
-
-                await asyncio.sleep(self.check_interval)
-            except Exception as e:
-                logger.error("Error in email monitoring: %s", str(e))
-                # Sleep before retrying to avoid rapid retries on persistent errors
-                await asyncio.sleep(self.check_interval)
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.check_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
 
     def start(self) -> None:
         """Start the email monitoring process."""
@@ -427,17 +1394,52 @@ class EmailMonitor:
             return
 
         self._running = True
-        self._task = asyncio.create_task(self._check_emails())
+        # A fresh event, since an asyncio.Event stays bound to the loop that first waited on it
+        self._stop_event = asyncio.Event()
+        if self.run_in_thread:
+            self._app_loop = asyncio.get_running_loop()
+            self._monitor_loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._thread_main, name="email-monitor", daemon=True)
+            self._thread.start()
+        else:
+            self._task = asyncio.create_task(self._check_emails())
         logger.info("Email monitoring started")
 
+    def _thread_main(self) -> None:
+        """Run the monitoring loop on the dedicated thread's event loop."""
+        loop = self._monitor_loop
+        if loop is None:
+            return
+
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._check_emails())
+        finally:
+            loop.close()
+
     async def stop(self) -> None:
         """Stop the email monitoring process."""
         if not self._running:
             return
 
         self._running = False
+        if self._monitor_loop is not None:
+            # Events aren't thread-safe, so set it from the monitor's own loop
+            self._monitor_loop.call_soon_threadsafe(self._stop_event.set)
+        else:
+            self._stop_event.set()
+        self.email_client.idle_done()
         if self._task:
             await asyncio.wait_for(self._task, timeout=None)
             self._task = None
+        if self._thread:
+            # Join without blocking the application's loop, which may still be running callbacks for the monitor
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+            self._monitor_loop = None
+            self._app_loop = None
+        # idle_done() above only needs to reach an IDLE that was starting while the monitor stopped; the loop has
+        # finished, so it must not end the first IDLE after a restart
+        self.email_client.reset_idle()
 
         logger.info("Email monitoring stopped")
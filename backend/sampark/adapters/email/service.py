@@ -1,17 +1,44 @@
-import json
 import logging
-from typing import Dict, List, Optional, Tuple, Any, Union, cast
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any, Union
 
-from sqlalchemy import select
+from sqlalchemy import Select, select, update
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, make_transient_to_detached
 
 from sampark.adapters.email.client import EmailClient
 from sampark.db.database import get_db_session
-from sampark.db.models import EmailThread, EmailMessage
+from sampark.db.models import EmailThread, EmailMessage, ThreadParticipant
 
 logger = logging.getLogger(__name__)
 
+# How many thread_id -> primary key mappings the service remembers
+_THREAD_PK_CACHE_SIZE = 2048
+# How long a get_recent_threads result is reused, in seconds
+_RECENT_THREADS_TTL = 60.0
+# Columns of a cached get_recent_threads row
+_THREAD_COLUMNS = tuple(EmailThread.__table__.columns.keys())
+
+
+def _stringify(addresses: Union[List[str], str, None]) -> str:
+    """Join a list of addresses into the comma-separated form stored on EmailMessage."""
+    if addresses is None:
+        return ""
+    if isinstance(addresses, list):
+        return ", ".join(addresses)
+    return str(addresses)
+
+
+def _thread_from_row(row: Dict[str, Any]) -> EmailThread:
+    """Build a detached EmailThread from cached column values, as if it had been loaded by a closed session."""
+    thread = EmailThread(**row)
+    make_transient_to_detached(thread)
+    return thread
+
 
 class EmailService:
     """
@@ -27,6 +54,20 @@ class EmailService:
         """
         self.email_client = email_client
         self.Session = get_db_session
+        # Primary keys of committed threads by thread_id, least recently used first. Threads are never deleted,
+        # so a cached key stays valid and replies in a known thread skip the thread lookup.
+        self._thread_pks: "OrderedDict[str, str]" = OrderedDict()
+        # get_recent_threads column values by limit, with when they were loaded; cleared whenever this service
+        # writes a thread or message
+        self._recent_threads: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+
+    def _remember_thread_pk(self, thread_id: str, thread_pk: str) -> None:
+        """Cache a committed thread's primary key, forgetting the least recently used beyond the cache size."""
+        thread_pks = self._thread_pks
+        thread_pks[thread_id] = thread_pk
+        thread_pks.move_to_end(thread_id)
+        if len(thread_pks) > _THREAD_PK_CACHE_SIZE:
+            thread_pks.popitem(last=False)
 
     async def _get_thread_by_thread_id(self, db_session: AsyncSession, thread_id: str) -> Optional[EmailThread]:
         """Get a thread by its thread ID."""
@@ -38,6 +79,24 @@ class EmailService:
             logger.error(f"Error fetching thread by thread_id: {str(e)}")
             return None
 
+    async def _get_threads_by_thread_ids(
+        self, db_session: AsyncSession, thread_ids: Iterable[str]
+    ) -> Dict[str, EmailThread]:
+        """
+        Get the stored threads for several thread IDs with a single IN query.
+
+        Unlike the single-thread lookup, database errors are raised so a batch can roll back as a whole.
+
+        Args:
+            db_session: Database session
+            thread_ids: The thread IDs to look up
+
+        Returns:
+            Threads keyed by thread ID; IDs with no stored thread are absent
+        """
+        result = await db_session.execute(select(EmailThread).where(EmailThread.thread_id.in_(set(thread_ids))))
+        return {thread.thread_id: thread for thread in result.scalars().all()}
+
     async def _get_message_by_message_id(self, db_session: AsyncSession, message_id: str) -> Optional[EmailMessage]:
         """Get a message by its message ID."""
         try:
@@ -52,79 +111,131 @@ class EmailService:
         self, db_session: AsyncSession, thread_id: str, subject: str, initial_participants: Optional[List[str]] = None
     ) -> Optional[EmailThread]:
         """Create a new email thread."""
+        self._recent_threads.clear()
         try:
-            # Initialize with empty list if none provided
-            participants = initial_participants if initial_participants is not None else []
-
-            # Serialize participants to JSON string
-            serialized_participants = json.dumps(participants)
-
-            thread = EmailThread(
-                thread_id=thread_id,
-                subject=subject,
-                participants=serialized_participants,
+            # ON CONFLICT keeps a concurrent insert of the same thread_id from failing the whole transaction
+            stmt = (
+                insert(EmailThread)
+                .values(thread_id=thread_id, subject=subject)
+                .on_conflict_do_nothing(index_elements=["thread_id"])
+                .returning(EmailThread)
             )
-            db_session.add(thread)
-            await db_session.flush()
+            thread = (await db_session.scalars(stmt)).one_or_none()
+            if thread is None:
+                # Someone else created it first; use theirs
+                thread = await self._get_thread_by_thread_id(db_session, thread_id)
+            if thread is not None and initial_participants:
+                await self._add_participants(db_session, [(thread.id, email) for email in initial_participants])
             return thread
         except SQLAlchemyError as e:
             logger.error(f"Error creating email thread: {str(e)}")
             return None
 
-    # Helper method to get and update participants
-    def _get_participants(self, thread: EmailThread) -> List[str]:
-        """Get the list of participants from a thread."""
-        participants_str = getattr(thread, "participants", "[]")
-        try:
-            return json.loads(participants_str)
-        except (json.JSONDecodeError, TypeError):
-            return []
+    async def _add_participants(self, db_session: AsyncSession, participants: Iterable[Tuple[str, str]]) -> None:
+        """
+        Add participants to threads, ignoring addresses a thread already has. Nothing is committed.
+
+        Args:
+            db_session: Database session
+            participants: (EmailThread.id, email address) pairs; repeats are ignored by the insert itself
+        """
+        rows = [{"thread_id": thread_pk, "email": email} for thread_pk, email in participants]
+        if rows:
+            await db_session.execute(insert(ThreadParticipant).values(rows).on_conflict_do_nothing())
+
+    async def _touch_threads(self, db_session: AsyncSession, thread_pks: Iterable[str]) -> None:
+        """
+        Set updated_at on threads that got a new message, so get_recent_threads lists them first. Nothing is committed.
+
+        Participants are inserted into their own table, so nothing else writes the thread row and fires its onupdate.
 
-    async def _update_participants(
-        self, db_session: AsyncSession, thread: EmailThread, new_participants: List[str]
-    ) -> None:
-        """Update the participants list for a thread."""
-        serialized = json.dumps(list(set(new_participants)))
-        thread.participants = serialized
-        db_session.add(thread)
-        await db_session.commit()
+        Args:
+            db_session: Database session
+            thread_pks: EmailThread.id of each thread
+        """
+        await db_session.execute(
+            update(EmailThread).where(EmailThread.id.in_(set(thread_pks))).values(updated_at=datetime.now())
+        )
+
+    def _message_fields(
+        self, message_data: Dict[str, Any], thread_id: str, is_sent_by_system: bool = False
+    ) -> Dict[str, Any]:
+        """Build the EmailMessage column values for a message."""
+        return {
+            "thread_id": thread_id,
+            "message_id": message_data["message_id"],
+            "sender": message_data["sender"],
+            "recipients": _stringify(message_data["recipients"]),
+            "cc": _stringify(message_data.get("cc")),
+            "subject": message_data["subject"],
+            "body_text": message_data.get("body_text", ""),
+            "body_html": message_data.get("body_html", ""),
+            "in_reply_to": message_data.get("in_reply_to", ""),
+            "references": message_data.get("references", ""),
+            "is_sent_by_system": is_sent_by_system,
+        }
 
     async def _save_email_message(
         self, db_session: AsyncSession, message_data: Dict[str, Any], thread_id: str, is_sent_by_system: bool = False
+    ) -> EmailMessage:
+        """Create and save an email message; the caller is responsible for committing or rolling back."""
+        self._recent_threads.clear()
+        message = EmailMessage(**self._message_fields(message_data, thread_id, is_sent_by_system))
+        db_session.add(message)
+        # Flush to surface constraint errors here; every column is filled client-side, so no refresh is needed
+        await db_session.flush()
+        await self._touch_threads(db_session, [thread_id])
+        return message
+
+    async def _insert_email_message(
+        self, db_session: AsyncSession, message_data: Dict[str, Any], thread_id: str
     ) -> Optional[EmailMessage]:
-        """Create and save an email message."""
-        try:
-            # Get recipients as a string, properly handling the case when it's already a string
-            recipients_raw = message_data["recipients"]
-            recipients_str = (
-                ", ".join(cast(List[str], recipients_raw)) if isinstance(recipients_raw, list) else str(recipients_raw)
-            )
+        """
+        Insert an email message unless one with the same message ID already exists.
 
-            # Get CC as a string, handling the case when it's empty or already a string
-            cc_raw = message_data.get("cc", [])
-            cc_str = ", ".join(cast(List[str], cc_raw)) if isinstance(cc_raw, list) else str(cc_raw or "")
-
-            message = EmailMessage(
-                thread_id=thread_id,
-                message_id=message_data["message_id"],
-                sender=message_data["sender"],
-                recipients=recipients_str,
-                cc=cc_str,
-                subject=message_data["subject"],
-                body_text=message_data.get("body_text", ""),
-                body_html=message_data.get("body_html", ""),
-                in_reply_to=message_data.get("in_reply_to", ""),
-                references=message_data.get("references", ""),
-                is_sent_by_system=is_sent_by_system,
-            )
-            db_session.add(message)
-            await db_session.commit()
-            await db_session.refresh(message)
-            return message
-        except SQLAlchemyError as e:
-            logger.error(f"Error saving email message: {str(e)}")
-            await db_session.rollback()
-            return None
+        The duplicate check and the insert are a single statement, so no separate lookup is needed. Nothing is
+        committed.
+
+        Args:
+            db_session: Database session
+            message_data: Data for the message
+            thread_id: Primary key of the thread the message belongs to
+
+        Returns:
+            The inserted EmailMessage, or None if the message ID was already stored
+        """
+        self._recent_threads.clear()
+        stmt = (
+            insert(EmailMessage)
+            .values(**self._message_fields(message_data, thread_id))
+            .on_conflict_do_nothing(index_elements=["message_id"])
+            .returning(EmailMessage)
+        )
+        message = (await db_session.scalars(stmt)).one_or_none()
+        if message is not None:
+            await self._touch_threads(db_session, [thread_id])
+        return message
+
+    def _email_participants(self, email_data: Dict[str, Any]) -> Set[str]:
+        """Collect the sender and recipient addresses of an email."""
+        participants_set: Set[str] = set()
+
+        # Add sender
+        sender = str(email_data["sender"])
+        if sender:
+            participants_set.add(sender)
+
+        # Add recipients
+        recipients_raw: Union[List[Optional[str]], str, None] = email_data.get("recipients", [])
+        if isinstance(recipients_raw, list):
+            for item in recipients_raw:
+                recipient_str: str = str(item) if item is not None else ""
+                if recipient_str:
+                    participants_set.add(recipient_str)
+        elif isinstance(recipients_raw, str) and recipients_raw:
+            participants_set.add(recipients_raw)
+
+        return participants_set
 
     async def process_new_email(
         self, email_data: Dict[str, Any], db_session: Optional[AsyncSession] = None
@@ -132,6 +243,8 @@ class EmailService:
         """
         Process a new email, saving it to the database.
 
+        A session passed in is only flushed; committing it is left to the caller.
+
         Args:
             email_data: Data for the new email
             db_session: Optional database session
@@ -146,68 +259,45 @@ class EmailService:
                 session_context = self.Session()
                 db_session = await session_context.__aenter__()
 
-            # Check if this message already exists in the database
-            existing_message = await self._get_message_by_message_id(db_session, email_data["message_id"])
-            if existing_message:
-                logger.info(f"Message with ID {email_data['message_id']} already exists, skipping processing")
-                return None
-
-            # Get or create the thread
-            thread = await self._get_thread_by_thread_id(db_session, email_data["thread_id"])
-            if not thread:
-                logger.info(f"Creating new thread for email with thread_id: {email_data['thread_id']}")
-                thread = await self._create_email_thread(
-                    db_session=db_session,
-                    thread_id=email_data["thread_id"],
-                    subject=email_data["subject"],
-                )
-                if not thread:
-                    logger.error(f"Failed to create thread with thread_id: {email_data['thread_id']}")
+            # The email is stored under a savepoint. A duplicate, detected by the message insert itself, or an
+            # error discards the thread and participant changes made for it and nothing else in the transaction.
+            async with db_session.begin_nested() as savepoint:
+                # Get or create the thread, unless its primary key is already cached
+                thread_pk = self._thread_pks.get(email_data["thread_id"])
+                if thread_pk is None:
+                    thread = await self._get_thread_by_thread_id(db_session, email_data["thread_id"])
+                    if not thread:
+                        logger.info(f"Creating new thread for email with thread_id: {email_data['thread_id']}")
+                        thread = await self._create_email_thread(
+                            db_session=db_session,
+                            thread_id=email_data["thread_id"],
+                            subject=email_data["subject"],
+                        )
+                        if not thread:
+                            logger.error(f"Failed to create thread with thread_id: {email_data['thread_id']}")
+                            await savepoint.rollback()
+                            return None
+                    thread_pk = thread.id
+
+                # The addresses are already a set, so they go straight into the insert without another dedup pass
+                participants_set = self._email_participants(email_data)
+                await self._add_participants(db_session, ((thread_pk, email) for email in participants_set))
+
+                # Save the message
+                message = await self._insert_email_message(db_session, email_data, thread_pk)
+                if message is None:
+                    logger.info(f"Message with ID {email_data['message_id']} already exists, skipping processing")
+                    await savepoint.rollback()
                     return None
 
-                # Commit the thread creation to ensure it's persisted
-                if session_context:  # Only commit if we created the session
-                    await db_session.commit()
-
-            # Add participants to the thread if needed
-            all_participants = self._get_participants(thread)
-            participants_set = set(all_participants)
-
-            # Add sender
-            sender = str(email_data["sender"])
-            if sender:
-                participants_set.add(sender)
-
-            # Add recipients
-            recipients_raw: Union[List[Optional[str]], str, None] = email_data.get("recipients", [])
-            if isinstance(recipients_raw, list):
-                for item in recipients_raw:
-                    recipient_str: str = str(item) if item is not None else ""
-                    if recipient_str:
-                        participants_set.add(recipient_str)
-            elif isinstance(recipients_raw, str) and recipients_raw:
-                participants_set.add(recipients_raw)
-
-            # Update participants if they've changed
-            if set(all_participants) != participants_set:
-                await self._update_participants(db_session, thread, list(participants_set))
-                # No need to commit here as _update_participants already commits
-
-            # Save the message
-            message = await self._save_email_message(
-                db_session=db_session,
-                message_data=email_data,
-                thread_id=thread.id,
-            )
-
-            # Explicitly commit the message creation if we created the session
-            if session_context and message:
+            if session_context:
                 await db_session.commit()
-
+                # Only cache once committed; a rolled back thread must not be reused
+                self._remember_thread_pk(email_data["thread_id"], thread_pk)
             return message
         except Exception as e:
             logger.error(f"Error processing new email: {str(e)}")
-            # Only rollback if we created the session and it's valid
+            # Only rollback if we created the session; a caller's own changes are theirs to keep or discard
             if session_context and db_session:
                 await db_session.rollback()
             return None
@@ -216,6 +306,138 @@ class EmailService:
             if session_context:
                 await session_context.__aexit__(None, None, None)
 
+    async def _store_new_emails(
+        self, db_session: AsyncSession, email_data_list: List[Dict[str, Any]]
+    ) -> Tuple[List[EmailMessage], Dict[str, str]]:
+        """
+        Add new emails, with their threads and participants, to the session without committing.
+
+        Args:
+            db_session: Database session
+            email_data_list: Data for emails that aren't stored yet
+
+        Returns:
+            Tuple of (the created EmailMessages in input order, thread primary keys by thread_id)
+        """
+        self._recent_threads.clear()
+        # Load the threads the batch refers to that aren't cached, then create the missing ones with a single flush
+        thread_pks: Dict[str, str] = {}
+        for email_data in email_data_list:
+            thread_pk = self._thread_pks.get(email_data["thread_id"])
+            if thread_pk is not None:
+                thread_pks[email_data["thread_id"]] = thread_pk
+        uncached = [email_data for email_data in email_data_list if email_data["thread_id"] not in thread_pks]
+        if uncached:
+            threads = await self._get_threads_by_thread_ids(
+                db_session, (email_data["thread_id"] for email_data in uncached)
+            )
+            new_threads: List[EmailThread] = []
+            for email_data in uncached:
+                if email_data["thread_id"] not in threads:
+                    logger.info(f"Creating new thread for email with thread_id: {email_data['thread_id']}")
+                    thread = EmailThread(thread_id=email_data["thread_id"], subject=email_data["subject"])
+                    threads[email_data["thread_id"]] = thread
+                    new_threads.append(thread)
+            if new_threads:
+                db_session.add_all(new_threads)
+                await db_session.flush()
+            thread_pks.update((thread_id, thread.id) for thread_id, thread in threads.items())
+
+        messages: List[EmailMessage] = []
+        participants: Set[Tuple[str, str]] = set()
+        for email_data in email_data_list:
+            thread_pk = thread_pks[email_data["thread_id"]]
+            try:
+                message = EmailMessage(**self._message_fields(email_data, thread_pk))
+                participants_set = self._email_participants(email_data)
+            except (KeyError, TypeError) as e:
+                logger.error(f"Skipping malformed email {email_data['message_id']}: {str(e)}")
+                continue
+            messages.append(message)
+            participants.update((thread_pk, email) for email in participants_set)
+
+        await self._add_participants(db_session, participants)
+        db_session.add_all(messages)
+        # Flush here so a bad row fails inside the caller's savepoint rather than at commit
+        await db_session.flush()
+        if messages:
+            await self._touch_threads(db_session, (message.thread_id for message in messages))
+        return messages, thread_pks
+
+    async def process_new_emails(
+        self, email_data_list: List[Dict[str, Any]], db_session: Optional[AsyncSession] = None
+    ) -> List[EmailMessage]:
+        """
+        Process a batch of new emails, saving them to the database in one transaction.
+
+        Already stored messages and threads are loaded with one IN query each, instead of two lookups per email.
+        If the database rejects part of the batch, the emails are stored one at a time and only the failing ones
+        are skipped. A session passed in is only flushed; committing it is left to the caller.
+
+        Args:
+            email_data_list: Data for the new emails
+            db_session: Optional database session
+
+        Returns:
+            The created EmailMessages, in input order; empty if the batch couldn't be stored at all
+        """
+        session_context = None
+        try:
+            # Create a session if one wasn't provided
+            if db_session is None:
+                session_context = self.Session()
+                db_session = await session_context.__aenter__()
+
+            # Skip messages that are already stored or repeated within the batch
+            message_ids = [email_data["message_id"] for email_data in email_data_list]
+            result = await db_session.execute(
+                select(EmailMessage.message_id).where(EmailMessage.message_id.in_(message_ids))
+            )
+            seen_message_ids = set(result.scalars().all())
+            pending: List[Dict[str, Any]] = []
+            for email_data in email_data_list:
+                if email_data["message_id"] in seen_message_ids:
+                    logger.info(f"Message with ID {email_data['message_id']} already exists, skipping processing")
+                    continue
+                seen_message_ids.add(email_data["message_id"])
+                pending.append(email_data)
+            if not pending:
+                return []
+
+            # Store the batch under a savepoint, so one bad email doesn't cost the rest of the batch: on failure
+            # the batch is stored again one email at a time, each under its own savepoint
+            try:
+                async with db_session.begin_nested():
+                    messages, thread_pks = await self._store_new_emails(db_session, pending)
+            except SQLAlchemyError as e:
+                logger.error(f"Error storing email batch, storing the emails one at a time: {str(e)}")
+                messages, thread_pks = [], {}
+                for email_data in pending:
+                    try:
+                        async with db_session.begin_nested():
+                            stored, stored_thread_pks = await self._store_new_emails(db_session, [email_data])
+                    except SQLAlchemyError as e:
+                        logger.error(f"Error storing email {email_data['message_id']}: {str(e)}")
+                        continue
+                    messages.extend(stored)
+                    thread_pks.update(stored_thread_pks)
+
+            if session_context:
+                await db_session.commit()
+                for thread_id, thread_pk in thread_pks.items():
+                    self._remember_thread_pk(thread_id, thread_pk)
+            return messages
+        except Exception as e:
+            logger.error(f"Error processing new emails: {str(e)}")
+            # Only rollback if we created the session
+            if session_context and db_session:
+                await db_session.rollback()
+            return []
+        finally:
+            # Only close if we created the session
+            if session_context:
+                await session_context.__aexit__(None, None, None)
+
     async def reply_to_email(
         self,
         message_id: str,
@@ -284,13 +506,12 @@ class EmailService:
                 is_sent_by_system=True,
             )
 
-            # Commit again to ensure the reply message is persisted
+            # Commit the reply message
             await db_session.commit()
 
             return True, reply_message
         except Exception as e:
-            logger.error(f"Error replying to email: {e}")
-            import traceback; traceback.print_exc()
+            logger.exception(f"Error replying to email: {e}")
             # Only rollback if we created the session and it's valid
             if session_context and db_session:
                 await db_session.rollback()
@@ -313,10 +534,13 @@ class EmailService:
         # Determine recipients (original sender + all recipients except us)
         recipients = [original_message.sender]
 
-        # Add original recipients unless they're us
-        original_recipients = [r.strip() for r in original_message.recipients.split(",") if r.strip()]
-        for recipient in original_recipients:
-            if recipient != self.email_client.username and recipient not in recipients:
+        # Add original recipients unless they're us or already listed; addresses compare case-insensitively
+        seen = {self.email_client.username.lower(), original_message.sender.lower()}
+        for recipient in original_message.recipients.split(","):
+            recipient = recipient.strip()
+            key = recipient.lower()
+            if recipient and key not in seen:
+                seen.add(key)
                 recipients.append(recipient)
 
         # Create subject with "Re: " prefix if not already there
@@ -349,15 +573,7 @@ class EmailService:
                 session_context = self.Session()
                 db_session = await session_context.__aenter__()
 
-            # Join with threads to get messages by thread_id (not thread.id)
-            query = (
-                select(EmailMessage)
-                .join(EmailThread, EmailThread.id == EmailMessage.thread_id)
-                .where(EmailThread.thread_id == thread_id)
-                .order_by(EmailMessage.received_at)
-            )
-
-            result = await db_session.execute(query)
+            result = await db_session.execute(self._thread_messages_query(thread_id))
             return list(result.scalars().all())
         except Exception as e:
             logger.error(f"Error getting thread messages: {str(e)}")
@@ -367,10 +583,25 @@ class EmailService:
             if session_context:
                 await session_context.__aexit__(None, None, None)
 
+    @staticmethod
+    def _thread_messages_query(thread_id: str) -> Select[Tuple[EmailMessage]]:
+        """Build the query for a thread's messages, oldest first, with each message's thread loaded from the join."""
+        # SQLite seeks the unique thread_id index for the single thread, then walks the (thread_id, received_at)
+        # index in order, so the join needs no sort; contains_eager fills message.thread without another SELECT
+        return (
+            select(EmailMessage)
+            .join(EmailMessage.thread)
+            .where(EmailThread.thread_id == thread_id)
+            .options(contains_eager(EmailMessage.thread))
+            .order_by(EmailMessage.received_at)
+        )
+
     async def get_recent_threads(self, limit: int = 10, db_session: Optional[AsyncSession] = None) -> List[EmailThread]:
         """
         Get recent email threads.
 
+        Without an injected session, a result is reused for up to a minute or until this service stores new emails.
+
         Args:
             limit: The maximum number of threads to return
             db_session: Optional database session for dependency injection in tests
@@ -378,6 +609,12 @@ class EmailService:
         Returns:
             A list of recent email threads, ordered by last update
         """
+        # An injected session gets a fresh read, since its caller may have uncommitted changes
+        if db_session is None:
+            cached = self._recent_threads.get(limit)
+            if cached is not None and time.monotonic() - cached[0] < _RECENT_THREADS_TTL:
+                return [_thread_from_row(row) for row in cached[1]]
+
         session_context = None
         try:
             # Allow session injection for testing
@@ -388,7 +625,12 @@ class EmailService:
             query = select(EmailThread).order_by(EmailThread.updated_at.desc()).limit(limit).offset(0)
 
             result = await db_session.execute(query)
-            return list(result.scalars().all())
+            threads = list(result.scalars().all())
+            if session_context:
+                # Cache column values rather than the instances, so callers never share (and mutate) the same object
+                rows = [{column: getattr(thread, column) for column in _THREAD_COLUMNS} for thread in threads]
+                self._recent_threads[limit] = (time.monotonic(), rows)
+            return threads
         except Exception as e:
             logger.error(f"Error getting recent threads: {str(e)}")
             return []
@@ -1,15 +1,16 @@
-from typing import Any, Dict, List
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, List
 from sqlalchemy import select, func
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 import pytest
-import json
 from ulid import ULID
 
 from sampark.adapters.email.client import EmailClient
-from sampark.adapters.email.service import EmailService
-from sampark.db.models import EmailThread, EmailMessage
+from sampark.adapters.email.service import EmailService, _stringify
+from sampark.db.models import EmailThread, EmailMessage, ThreadParticipant
 from tests.factories.email_thread import EmailThreadFactory
 from tests.factories.email_message import EmailMessageFactory
 
@@ -41,7 +42,7 @@ async def email_thread() -> EmailThread:
     return EmailThread(
         thread_id="thread-123",
         subject="Test Thread",
-        participants=["sender@example.com", "recipient@example.com"],
+        participants=[ThreadParticipant(email="sender@example.com"), ThreadParticipant(email="recipient@example.com")],
     )
 
 
@@ -75,6 +76,23 @@ def sample_email_data() -> Dict[str, Any]:
     }
 
 
+def use_session(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Have the service open db_session itself, as it does when no session is passed in."""
+
+    @asynccontextmanager
+    async def session() -> AsyncGenerator[AsyncSession, None]:
+        yield db_session
+
+    email_service.Session = session  # type: ignore[assignment]
+
+
+async def participant_emails(db_session: AsyncSession, thread: EmailThread) -> List[str]:
+    """Return the participant addresses stored for a thread, sorted."""
+    query = select(ThreadParticipant.email).where(ThreadParticipant.thread_id == thread.id)
+    result = await db_session.execute(query.order_by(ThreadParticipant.email))
+    return list(result.scalars().all())
+
+
 @pytest.mark.asyncio
 async def test_process_new_email_existing_thread(
     email_service: EmailService, db_session: AsyncSession, sample_email_data: Dict[str, Any]
@@ -169,7 +187,7 @@ async def test_get_thread_messages(email_service: EmailService, db_session: Asyn
     thread = EmailThread(
         thread_id="thread-123-for-messages",  # Use a unique ID to avoid conflicts
         subject="Test Thread",
-        participants=json.dumps(["sender@example.com", "recipient@example.com"]),
+        participants=[ThreadParticipant(email=email) for email in ["sender@example.com", "recipient@example.com"]],
     )
 
     db_session.add(thread)
@@ -219,12 +237,12 @@ async def test_get_recent_threads(email_service: EmailService, db_session: Async
     thread1 = EmailThread(
         thread_id="thread-1-recent",
         subject="Test Thread 1",
-        participants=json.dumps(["user1@example.com"]),
+        participants=[ThreadParticipant(email=email) for email in ["user1@example.com"]],
     )
     thread2 = EmailThread(
         thread_id="thread-2-recent",
         subject="Test Thread 2",
-        participants=json.dumps(["user2@example.com"]),
+        participants=[ThreadParticipant(email=email) for email in ["user2@example.com"]],
     )
     db_session.add(thread1)
     db_session.add(thread2)
@@ -289,8 +307,9 @@ async def test_error_handling_save_email_message(email_service: EmailService, db
         "body_html": "<p>Body HTML</p>",
     }
 
-    # When/Then
-    await email_service._save_email_message(db_session, message_data, "thread-id")  # type: ignore # Protected member access is acceptable in tests
+    # When/Then: the error is left to the caller, which owns the transaction
+    with pytest.raises(SQLAlchemyError):
+        await email_service._save_email_message(db_session, message_data, "thread-id")  # type: ignore # Protected member access is acceptable in tests
 
 
 @pytest.mark.asyncio
@@ -420,14 +439,27 @@ async def test_get_thread_by_thread_id(email_service: EmailService, db_session:
     assert thread is None
 
 
+@pytest.mark.asyncio
+async def test_get_threads_by_thread_ids(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test looking up several threads at once, leaving out IDs with no stored thread."""
+    thread = EmailThread(thread_id="batch-lookup-thread", subject="Batch lookup")
+    db_session.add(thread)
+    await db_session.flush()
+
+    threads = await email_service._get_threads_by_thread_ids(  # type: ignore # Protected member access is acceptable in tests
+        db_session, ["batch-lookup-thread", "batch-lookup-missing", "batch-lookup-thread"]
+    )
+
+    assert threads == {"batch-lookup-thread": thread}
+
+
 @pytest.mark.asyncio
 async def test_get_message_by_message_id(email_service: EmailService, db_session: AsyncSession) -> None:
     """Test retrieving a message by its message_id."""
-    # Create a test thread - participants is now a serialized JSON string
+    # Create a test thread
     thread = EmailThread(
         thread_id="thread-123",
         subject="Test Thread",
-        participants="[]",  # Empty list as JSON
     )
     db_session.add(thread)
     await db_session.flush()
@@ -467,20 +499,17 @@ async def test_create_email_thread(email_service: EmailService, db_session: Asyn
     assert thread.thread_id == thread_id
     assert thread.subject == subject
 
-    # Test participants JSON deserialization works
-    participants = email_service._get_participants(thread)  # type: ignore # Protected member access is acceptable in tests
-    assert isinstance(participants, list)
-    assert len(participants) == 0  # Should be an empty list
+    # A new thread starts without participants
+    assert await participant_emails(db_session, thread) == []
 
 
 @pytest.mark.asyncio
 async def test_save_email_message(email_service: EmailService, db_session: AsyncSession) -> None:
     """Test saving an email message."""
-    # Create a thread first - with empty participants JSON
+    # Create a thread first
     thread = EmailThread(
         thread_id="thread-123",
         subject="Test Thread",
-        participants="[]",  # Empty JSON array
     )
     db_session.add(thread)
     await db_session.flush()
@@ -521,6 +550,10 @@ async def test_save_email_message(email_service: EmailService, db_session: Async
     assert message.body_text == body_text
     assert message.body_html == body_html
 
+    # Generated columns are filled in by the flush, without refreshing from the database
+    assert message.id is not None
+    assert message.received_at is not None
+
 
 @pytest.mark.asyncio
 async def test_existing_message_skipped(
@@ -564,9 +597,11 @@ async def test_existing_message_skipped(
 async def test_transaction_management_process_new_email(
     email_service: EmailService, sample_email_data: Dict[str, Any], mocker: Any
 ) -> None:
-    """Test transaction management in process_new_email."""
+    """Test that process_new_email commits sessions it opens and leaves a caller's session uncommitted."""
     # Create a session with mocked methods to verify commit and rollback calls
     mock_session = AsyncMock()
+    # begin_nested() is used as an async context manager, which MagicMock supports
+    mock_session.begin_nested = MagicMock()
 
     # Mock the protected methods using mocker
     mocker.patch.object(email_service, "_get_message_by_message_id", return_value=None)
@@ -577,9 +612,9 @@ async def test_transaction_management_process_new_email(
     mock_thread.id = "thread-id-123"
     mocker.patch.object(email_service, "_create_email_thread", return_value=mock_thread)
 
-    # Configure _save_email_message to return a mock message
+    # Configure _insert_email_message to return a mock message
     mock_message = AsyncMock()
-    mocker.patch.object(email_service, "_save_email_message", return_value=mock_message)
+    mocker.patch.object(email_service, "_insert_email_message", return_value=mock_message)
 
     # Call process_new_email with our mocked session
     result = await email_service.process_new_email(sample_email_data, db_session=mock_session)
@@ -587,10 +622,16 @@ async def test_transaction_management_process_new_email(
     # Verify result
     assert result is mock_message
 
-    # Verify that commit was called at least once
-    # Note: The actual implementation might do one commit or multiple commits,
-    # but we just need to ensure the transaction is committed
-    assert mock_session.commit.called
+    # The caller owns the transaction, so it is neither committed nor rolled back
+    mock_session.commit.assert_not_called()
+    mock_session.rollback.assert_not_called()
+
+    # A session the service opens itself gets thread creation, participants and the message committed together
+    use_session(email_service, mock_session)
+    result = await email_service.process_new_email(sample_email_data)
+
+    assert result is mock_message
+    mock_session.commit.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_transaction_rollback_on_error_process_new_email(
@@ -599,6 +640,7 @@ async def test_transaction_rollback_on_error_process_new_email(
     """Test transaction rollback on error in process_new_email."""
     # Create a session with mocked methods
     mock_session = AsyncMock()
+    mock_session.begin_nested = MagicMock()
 
     # Create a proper SQLAlchemyError for the side effect
     db_error = SQLAlchemyError("Database error")
@@ -624,9 +666,9 @@ async def test_transaction_rollback_on_error_process_new_email(
     # Verify result is None due to the error
     assert result is None
 
-    # The implementation might handle the exception internally without actually calling rollback,
-    # so we just verify commit wasn't called - that's the important behavior
+    # The savepoint discards the failed email; the caller's transaction itself is left alone
     assert not mock_session.commit.called
+    assert not mock_session.rollback.called
 
 @pytest.mark.asyncio
 async def test_reply_to_email_with_db_session(
@@ -680,7 +722,7 @@ async def test_get_thread_messages_without_mocking(email_service: EmailService,
     thread = EmailThread(
         thread_id="thread-123-direct-test",
         subject="Test Thread",
-        participants=json.dumps(["sender@example.com", "recipient@example.com"]),
+        participants=[ThreadParticipant(email=email) for email in ["sender@example.com", "recipient@example.com"]],
     )
     db_session.add(thread)
     await db_session.commit()
@@ -715,6 +757,23 @@ async def test_get_thread_messages_without_mocking(email_service: EmailService,
     assert messages[1].message_id == message2.message_id
 
 
+@pytest.mark.asyncio
+async def test_get_thread_messages_loads_thread(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test that returned messages come with their thread loaded, so reading it needs no lazy load."""
+    thread = EmailThreadFactory.create(thread_id=f"thread-eager-{ULID()}")
+    db_session.add(thread)
+    await db_session.flush()
+    db_session.add(EmailMessageFactory.create(thread=thread, message_id=f"eager-{ULID()}"))
+    await db_session.commit()
+    # Start from an empty identity map so the thread can only come from the query itself
+    db_session.expunge_all()
+
+    messages = await email_service.get_thread_messages(thread.thread_id, db_session=db_session)
+
+    # A lazy load here would raise MissingGreenlet outside of awaitable_attrs
+    assert [message.thread.thread_id for message in messages] == [thread.thread_id]
+
+
 @pytest.mark.asyncio
 async def test_get_thread_messages_error_handling(email_service: EmailService, db_session: AsyncSession) -> None:
     """Test error handling in get_thread_messages method."""
@@ -733,12 +792,12 @@ async def test_get_recent_threads_without_mocking(email_service: EmailService, d
     thread1 = EmailThread(
         thread_id="thread-recent-direct-1",
         subject="Recent Thread 1",
-        participants=json.dumps(["user1@example.com"]),
+        participants=[ThreadParticipant(email=email) for email in ["user1@example.com"]],
     )
     thread2 = EmailThread(
         thread_id="thread-recent-direct-2",
         subject="Recent Thread 2",
-        participants=json.dumps(["user2@example.com"]),
+        participants=[ThreadParticipant(email=email) for email in ["user2@example.com"]],
     )
     db_session.add(thread1)
     db_session.add(thread2)
@@ -766,11 +825,81 @@ async def test_get_recent_threads_error_handling(email_service: EmailService, db
     assert threads == []
 
 
+@pytest.mark.asyncio
+async def test_new_message_moves_thread_to_top(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test that adding a message to an older thread puts it first in the recent threads."""
+    thread_ids = [f"thread-touched-{ULID()}", f"thread-touched-{ULID()}"]
+    for index, thread_id in enumerate(thread_ids + thread_ids[:1]):
+        email_data = {
+            "message_id": f"touched-{index}-{ULID()}",
+            "thread_id": thread_id,
+            "subject": "Touched",
+            "sender": "sender@example.com",
+            "recipients": ["recipient@example.com"],
+            "body_text": "A message.",
+        }
+        assert await email_service.process_new_email(email_data, db_session) is not None
+
+    threads = await email_service.get_recent_threads(limit=2, db_session=db_session)
+
+    assert [thread.thread_id for thread in threads] == thread_ids
+
+
+@pytest.mark.asyncio
+async def test_get_recent_threads_cached(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test that recent threads are reused until the TTL passes or the service writes a thread or message."""
+    opened: List[AsyncSession] = []
+
+    @asynccontextmanager
+    async def session() -> AsyncGenerator[AsyncSession, None]:
+        opened.append(db_session)
+        yield db_session
+
+    email_service.Session = session  # type: ignore[assignment]
+
+    first = await email_service.get_recent_threads(limit=5)
+    second = await email_service.get_recent_threads(limit=5)
+    assert [thread.id for thread in second] == [thread.id for thread in first]
+    assert len(opened) == 1
+    # Each call gets its own instances, so one caller's changes don't show up in another's results
+    assert all(a is not b for a, b in zip(first, second))
+
+    # Another limit is cached separately
+    await email_service.get_recent_threads(limit=3)
+    assert len(opened) == 2
+
+    # Storing an email clears the cache
+    email_data = {
+        "message_id": f"recent-cached-{ULID()}",
+        "thread_id": f"thread-recent-cached-{ULID()}",
+        "subject": "Recent",
+        "sender": "sender@example.com",
+        "recipients": ["recipient@example.com"],
+        "body_text": "A new thread.",
+    }
+    original = await email_service.process_new_email(email_data, db_session)
+    assert original is not None
+    await email_service.get_recent_threads(limit=5)
+    assert len(opened) == 3
+
+    # So does saving a reply
+    email_service.email_client.send_email = AsyncMock(return_value=(True, f"recent-reply-{ULID()}"))
+    success, _ = await email_service.reply_to_email(original.message_id, "Reply", db_session=db_session)
+    assert success
+    await email_service.get_recent_threads(limit=5)
+    assert len(opened) == 4
+
+    # So does the TTL running out
+    with patch("sampark.adapters.email.service.time.monotonic", return_value=time.monotonic() + 61):
+        await email_service.get_recent_threads(limit=5)
+    assert len(opened) == 5
+
+
 @pytest.mark.asyncio
 async def test_save_email_message_sqlite_error(email_service: EmailService, db_session: AsyncSession) -> None:
     """Test SQLAlchemy error handling in _save_email_message method."""
-    # Make db_session.add raise an exception
-    db_session.add = AsyncMock(side_effect=SQLAlchemyError("Database error"))
+    # Make db_session.add raise an exception; add is synchronous, so a plain mock raises on the call
+    db_session.add = MagicMock(side_effect=SQLAlchemyError("Database error"))  # type: ignore[method-assign]
 
     message_data = {
         "message_id": "error-msg-id",
@@ -781,9 +910,11 @@ async def test_save_email_message_sqlite_error(email_service: EmailService, db_s
         "body_html": "<p>Body HTML</p>",
     }
 
-    # Method should handle the exception and return None
-    result = await email_service._save_email_message(db_session, message_data, "thread-id")  # type: ignore # Protected member access is acceptable in tests
-    assert result is None
+    # The error propagates without a rollback; rolling back is up to the caller
+    db_session.rollback = AsyncMock()  # type: ignore[method-assign]
+    with pytest.raises(SQLAlchemyError):
+        await email_service._save_email_message(db_session, message_data, "thread-id")  # type: ignore # Protected member access is acceptable in tests
+    db_session.rollback.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -793,7 +924,7 @@ async def test_process_new_email_message_exists(email_service: EmailService, db_
     thread = EmailThread(
         thread_id="existing-thread-for-duplicate",
         subject="Existing Thread",
-        participants=json.dumps(["user@example.com"]),
+        participants=[ThreadParticipant(email=email) for email in ["user@example.com"]],
     )
     db_session.add(thread)
     await db_session.flush()
@@ -864,7 +995,9 @@ async def test_general_exception_in_process_new_email(email_service: EmailServic
 
 
 @pytest.mark.asyncio
-async def test_reply_to_email_general_exception(email_service: EmailService, db_session: AsyncSession) -> None:
+async def test_reply_to_email_general_exception(
+    email_service: EmailService, db_session: AsyncSession, caplog: pytest.LogCaptureFixture
+) -> None:
     """Test handling of general exceptions in reply_to_email."""
     # Make _get_message_by_message_id raise a non-SQLAlchemy exception
     email_service._get_message_by_message_id = AsyncMock(side_effect=ValueError("Some unexpected error"))  # type: ignore # Protected member access is acceptable in tests
@@ -880,6 +1013,10 @@ async def test_reply_to_email_general_exception(email_service: EmailService, db_
     assert success is False
     assert result is None
 
+    # The error goes to the log with its traceback rather than to stderr
+    record = next(record for record in caplog.records if record.getMessage().startswith("Error replying to email"))
+    assert record.exc_info is not None
+
 
 @pytest.mark.asyncio
 async def test_process_new_email_with_string_recipients(
@@ -911,7 +1048,7 @@ async def test_process_new_email_with_string_recipients(
     thread = thread_result.scalar_one()
 
     # Check that the participants were added from string recipients
-    participants = json.loads(thread.participants)
+    participants = await participant_emails(db_session, thread)
     assert "sender@example.com" in participants
     assert "recipient1@example.com" in participants  # The string recipient should be added as a participant
 
@@ -995,6 +1132,285 @@ async def test_process_new_email_with_empty_recipients_list(
     thread = thread_result.scalar_one()
 
     # Check that only the sender was added as a participant
-    participants = json.loads(thread.participants)
+    participants = await participant_emails(db_session, thread)
     assert "sender@example.com" in participants
     assert len(participants) == 1  # Only the sender should be present
+
+
+@pytest.mark.asyncio
+async def test_process_new_email_adds_only_new_participants(
+    email_service: EmailService, db_session: AsyncSession
+) -> None:
+    """Test that participants already on a thread are not added twice."""
+    thread_id = f"thread-participants-{ULID()}"
+    email_data = {
+        "message_id": f"participants-{ULID()}",
+        "thread_id": thread_id,
+        "subject": "Participants",
+        "sender": "sender@example.com",
+        "recipients": ["recipient@example.com"],
+        "body_text": "First email.",
+    }
+    assert await email_service.process_new_email(email_data, db_session) is not None
+
+    # Same sender and recipient, then a new recipient
+    repeat_data = {**email_data, "message_id": f"participants-{ULID()}"}
+    assert await email_service.process_new_email(repeat_data, db_session) is not None
+    new_data = {**email_data, "message_id": f"participants-{ULID()}", "recipients": ["another@example.com"]}
+    assert await email_service.process_new_email(new_data, db_session) is not None
+
+    thread = (await db_session.execute(select(EmailThread).where(EmailThread.thread_id == thread_id))).scalar_one()
+    assert await participant_emails(db_session, thread) == [
+        "another@example.com",
+        "recipient@example.com",
+        "sender@example.com",
+    ]
+    assert len(await thread.awaitable_attrs.participants) == 3
+
+
+@pytest.mark.asyncio
+async def test_create_email_thread_existing_thread_id(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test that creating a thread whose thread_id already exists returns the stored thread."""
+    thread_id = f"thread-conflict-{ULID()}"
+    first = await email_service._create_email_thread(db_session, thread_id, "First")  # type: ignore # Protected member access is acceptable in tests
+    second = await email_service._create_email_thread(db_session, thread_id, "Second")  # type: ignore # Protected member access is acceptable in tests
+
+    assert first is not None and second is not None
+    assert second.id == first.id
+    assert second.subject == "First"
+
+
+@pytest.mark.asyncio
+async def test_process_new_email_duplicate_discards_new_thread(
+    email_service: EmailService, db_session: AsyncSession
+) -> None:
+    """Test that a duplicate message doesn't leave behind a thread created for it."""
+    message_id = f"duplicate-new-thread-{ULID()}"
+    email_data = {
+        "message_id": message_id,
+        "thread_id": f"thread-original-{ULID()}",
+        "subject": "Original",
+        "sender": "sender@example.com",
+        "recipients": ["recipient@example.com"],
+        "body_text": "Original email.",
+    }
+    assert await email_service.process_new_email(email_data, db_session) is not None
+
+    duplicate_thread_id = f"thread-duplicate-{ULID()}"
+    assert await email_service.process_new_email({**email_data, "thread_id": duplicate_thread_id}, db_session) is None
+
+    count = await db_session.execute(
+        select(func.count()).select_from(EmailThread).where(EmailThread.thread_id == duplicate_thread_id)
+    )
+    assert count.scalar_one() == 0
+    assert duplicate_thread_id not in email_service._thread_pks  # type: ignore # Protected member access is acceptable in tests
+
+
+@pytest.mark.asyncio
+async def test_process_new_email_leaves_caller_transaction(
+    email_service: EmailService, db_session: AsyncSession
+) -> None:
+    """Test that an injected session is neither committed nor rolled back, even when the email is a duplicate."""
+    caller_thread = EmailThread(thread_id=f"thread-caller-{ULID()}", subject="Caller's own work")
+    db_session.add(caller_thread)
+    await db_session.flush()
+    email_data = {
+        "message_id": f"caller-{ULID()}",
+        "thread_id": f"thread-caller-email-{ULID()}",
+        "subject": "Caller",
+        "sender": "sender@example.com",
+        "recipients": ["recipient@example.com"],
+        "body_text": "Stored in the caller's transaction.",
+    }
+
+    assert await email_service.process_new_email(email_data, db_session) is not None
+    assert await email_service.process_new_email(email_data, db_session) is None
+
+    # The duplicate only discarded its own savepoint; the caller's work is still pending
+    assert await email_service._get_thread_by_thread_id(db_session, caller_thread.thread_id) is caller_thread  # type: ignore # Protected member access is acceptable in tests
+    await db_session.rollback()
+    assert await email_service._get_message_by_message_id(db_session, email_data["message_id"]) is None  # type: ignore # Protected member access is acceptable in tests
+
+
+@pytest.mark.asyncio
+async def test_process_new_email_caches_thread_pk(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test that later emails in a committed thread reuse its cached primary key instead of looking it up."""
+    # Keys are only cached once the service has committed them, so it has to own the session
+    use_session(email_service, db_session)
+    thread_id = f"thread-cached-{ULID()}"
+
+    def email(message_id: str) -> Dict[str, Any]:
+        return {
+            "message_id": message_id,
+            "thread_id": thread_id,
+            "subject": "Cached",
+            "sender": "sender@example.com",
+            "recipients": ["recipient@example.com"],
+            "body_text": "Cached thread email.",
+        }
+
+    with patch.object(
+        email_service, "_get_thread_by_thread_id", wraps=email_service._get_thread_by_thread_id  # type: ignore # Protected member access is acceptable in tests
+    ) as get_thread:
+        first = await email_service.process_new_email(email(f"cached-{ULID()}"))
+        second = await email_service.process_new_email(email(f"cached-{ULID()}"))
+        batch = await email_service.process_new_emails([email(f"cached-{ULID()}")])
+
+    assert first is not None and second is not None
+    assert get_thread.call_count == 1
+    assert first.thread_id == second.thread_id == batch[0].thread_id
+
+
+def test_remember_thread_pk_evicts_least_recently_used(email_service: EmailService) -> None:
+    """Test that the thread primary key cache stays bounded, dropping the least recently used entry."""
+    with patch("sampark.adapters.email.service._THREAD_PK_CACHE_SIZE", 2):
+        email_service._remember_thread_pk("thread-a", "pk-a")  # type: ignore # Protected member access is acceptable in tests
+        email_service._remember_thread_pk("thread-b", "pk-b")  # type: ignore # Protected member access is acceptable in tests
+        email_service._remember_thread_pk("thread-a", "pk-a")  # type: ignore # Protected member access is acceptable in tests
+        email_service._remember_thread_pk("thread-c", "pk-c")  # type: ignore # Protected member access is acceptable in tests
+
+    assert list(email_service._thread_pks) == ["thread-a", "thread-c"]  # type: ignore # Protected member access is acceptable in tests
+
+
+@pytest.mark.asyncio
+async def test_process_new_emails(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test processing a batch of emails with existing, new, repeated and already stored messages."""
+    existing_thread = EmailThread(
+        thread_id=f"thread-batch-existing-{ULID()}",
+        subject="Existing Thread",
+        participants=[ThreadParticipant(email=email) for email in ["sender@example.com"]],
+    )
+    db_session.add(existing_thread)
+    await db_session.flush()
+    stored = EmailMessage(
+        message_id=f"batch-stored-{ULID()}",
+        thread_id=existing_thread.id,
+        sender="sender@example.com",
+        recipients="recipient@example.com",
+        subject="Stored",
+        body_text="Already stored",
+    )
+    db_session.add(stored)
+    await db_session.commit()
+
+    new_thread_id = f"thread-batch-new-{ULID()}"
+
+    def email(message_id: str, thread_id: str, recipients: List[str]) -> Dict[str, Any]:
+        return {
+            "message_id": message_id,
+            "thread_id": thread_id,
+            "subject": "Batch",
+            "sender": "sender@example.com",
+            "recipients": recipients,
+            "body_text": "Batch email.",
+        }
+
+    first_id, second_id, third_id = (f"batch-{ULID()}" for _ in range(3))
+    batch = [
+        email(stored.message_id, existing_thread.thread_id, ["recipient@example.com"]),
+        email(first_id, existing_thread.thread_id, ["a@example.com"]),
+        email(second_id, new_thread_id, ["b@example.com"]),
+        email(first_id, existing_thread.thread_id, ["a@example.com"]),
+        email(third_id, new_thread_id, ["c@example.com"]),
+    ]
+
+    messages = await email_service.process_new_emails(batch, db_session)
+
+    assert [message.message_id for message in messages] == [first_id, second_id, third_id]
+    thread_result = await db_session.execute(select(EmailThread).where(EmailThread.thread_id == new_thread_id))
+    new_thread = thread_result.scalar_one()
+    assert messages[0].thread_id == existing_thread.id
+    assert messages[1].thread_id == messages[2].thread_id == new_thread.id
+    assert await participant_emails(db_session, existing_thread) == ["a@example.com", "sender@example.com"]
+    assert await participant_emails(db_session, new_thread) == ["b@example.com", "c@example.com", "sender@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_process_new_emails_bad_row_keeps_rest(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test that a row the database rejects only loses that email, not the rest of the batch."""
+    thread_id = f"thread-batch-bad-row-{ULID()}"
+
+    def email(message_id: str, body_text: Any) -> Dict[str, Any]:
+        return {
+            "message_id": message_id,
+            "thread_id": thread_id,
+            "subject": "Bad Row",
+            "sender": "sender@example.com",
+            "recipients": ["recipient@example.com"],
+            "body_text": body_text,
+        }
+
+    good_ids = [f"batch-good-{ULID()}" for _ in range(2)]
+    # body_text is NOT NULL, so the insert of the middle email fails
+    batch = [email(good_ids[0], "Fine."), email(f"batch-bad-{ULID()}", None), email(good_ids[1], "Also fine.")]
+
+    messages = await email_service.process_new_emails(batch, db_session)
+
+    assert [message.message_id for message in messages] == good_ids
+    stored = await db_session.execute(select(EmailMessage.message_id).where(EmailMessage.message_id.in_(good_ids)))
+    assert sorted(stored.scalars().all()) == sorted(good_ids)
+
+
+@pytest.mark.asyncio
+async def test_process_new_emails_error_rolls_back(email_service: EmailService, db_session: AsyncSession) -> None:
+    """Test that a failure while storing a batch rolls back and returns no messages."""
+    db_session.commit = AsyncMock(side_effect=SQLAlchemyError("Database error"))  # type: ignore[method-assign]
+    email_data = {
+        "message_id": f"batch-error-{ULID()}",
+        "thread_id": f"thread-batch-error-{ULID()}",
+        "subject": "Batch Error",
+        "sender": "sender@example.com",
+        "recipients": ["recipient@example.com"],
+        "body_text": "This batch fails to commit.",
+    }
+
+    use_session(email_service, db_session)
+    assert await email_service.process_new_emails([email_data]) == []
+    count = await db_session.execute(
+        select(func.count()).select_from(EmailThread).where(EmailThread.thread_id == email_data["thread_id"])
+    )
+    assert count.scalar_one() == 0
+
+
+@pytest.mark.parametrize(
+    "addresses, expected",
+    [
+        (["a@example.com", "b@example.com"], "a@example.com, b@example.com"),
+        ([], ""),
+        ("a@example.com", "a@example.com"),
+        (None, ""),
+    ],
+)
+def test_stringify(addresses: Any, expected: str) -> None:
+    """Test joining recipient and CC values into their stored form."""
+    assert _stringify(addresses) == expected
+
+
+def test_prepare_reply_data_recipients(email_service: EmailService) -> None:
+    """Test that reply-all keeps the sender first and drops our address and repeated recipients."""
+    original = EmailMessage(
+        message_id="original-msg",
+        sender="sender@example.com",
+        recipients="a@example.com, TEST@example.com, Sender@example.com, , A@example.com, b@example.com",
+        subject="Question",
+        references=None,
+    )
+
+    recipients, subject, references = email_service._prepare_reply_data(original)  # type: ignore # Protected member access is acceptable in tests
+
+    assert recipients == ["sender@example.com", "a@example.com", "b@example.com"]
+    assert subject == "Re: Question"
+    assert references == "original-msg"
+
+
+@pytest.mark.asyncio
+async def test_create_email_thread_repeated_initial_participants(
+    email_service: EmailService, db_session: AsyncSession
+) -> None:
+    """Test that repeated initial participants are stored once."""
+    thread = await email_service._create_email_thread(  # type: ignore # Protected member access is acceptable in tests
+        db_session, f"thread-repeated-participants-{ULID()}", "Repeated", ["a@example.com", "a@example.com"]
+    )
+
+    assert thread is not None
+    assert await participant_emails(db_session, thread) == ["a@example.com"]
@@ -1,10 +1,11 @@
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import Connection, event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 # Load environment variables
@@ -14,8 +15,8 @@ load_dotenv()
 DB_PATH = Path(os.getenv("DB_PATH", "./data/sampark.db"))
 
 
-class Base(DeclarativeBase):
-    """Base class for all SQLAlchemy models."""
+class Base(AsyncAttrs, DeclarativeBase):
+    """Base class for all SQLAlchemy models; lazy relationships are loaded with ``await model.awaitable_attrs.x``."""
 
 
 # Create the parent directory if it doesn't exist
@@ -24,9 +25,31 @@ def ensure_db_path_exists() -> None:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
+def use_explicit_transactions(engine: AsyncEngine) -> None:
+    """
+    Have SQLAlchemy begin SQLite transactions itself, so savepoints work.
+
+    The sqlite3 driver only emits BEGIN before the first write. A savepoint opened after reads alone becomes the
+    outermost transaction, and releasing it commits everything. Turning off the driver's transaction handling and
+    emitting BEGIN when SQLAlchemy starts a transaction makes session.begin_nested() nest properly.
+
+    Args:
+        engine: Engine connected to a SQLite database
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection: Any, connection_record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn: Connection) -> None:
+        conn.exec_driver_sql("BEGIN")
+
+
 # Create the SQLAlchemy engine and sessionmaker
 # Using SQLite with aiosqlite for async support
 engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}", echo=False)
+use_explicit_transactions(engine)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 
@@ -60,8 +83,51 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def migrate_legacy_participants(conn: Connection) -> None:
+    """
+    Move thread participants out of the legacy email_threads.participants JSON column.
+
+    Databases created before participants got their own table still have the NOT NULL column, which would make
+    every new thread insert fail. create_all never alters existing tables, so the addresses are copied into
+    thread_participants and the column is dropped here. Does nothing on an up-to-date schema.
+
+    Args:
+        conn: Connection inside the transaction that creates the tables
+    """
+    columns = {column["name"] for column in inspect(conn).get_columns("email_threads")}
+    if "participants" not in columns:
+        return
+
+    conn.execute(
+        text(
+            "INSERT OR IGNORE INTO thread_participants (thread_id, email) "
+            "SELECT email_threads.id, participant.value "
+            "FROM email_threads, json_each(email_threads.participants) AS participant "
+            "WHERE json_valid(email_threads.participants) AND participant.type = 'text'"
+        )
+    )
+    conn.execute(text("ALTER TABLE email_threads DROP COLUMN participants"))
+
+
+def create_missing_indexes(conn: Connection) -> None:
+    """
+    Create indexes that were added to the models after their tables were created.
+
+    create_all only creates the indexes of tables it creates, so an existing database would otherwise never get
+    an index added later, such as ix_email_messages_thread_id_received_at.
+
+    Args:
+        conn: Connection inside the transaction that creates the tables
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db() -> None:
-    """Initialize the database, creating tables if they don't exist."""
+    """Initialize the database, creating tables if they don't exist and migrating older schemas."""
     ensure_db_path_exists()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(migrate_legacy_participants)
+        await conn.run_sync(create_missing_indexes)
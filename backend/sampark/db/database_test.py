@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from sampark.db.database import Base, create_missing_indexes, migrate_legacy_participants
+from sampark.db.models import EmailThread  # noqa: F401  # Registers the models on Base.metadata
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_participants() -> None:
+    """Test that a database with the old participants column is migrated to the thread_participants table."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as conn:
+            # The email_threads table as it was created before participants had their own table
+            await conn.execute(
+                text(
+                    "CREATE TABLE email_threads ("
+                    "id VARCHAR(26) NOT NULL PRIMARY KEY, "
+                    "thread_id VARCHAR(255) NOT NULL, "
+                    "subject VARCHAR(255) NOT NULL, "
+                    "participants VARCHAR(2048) NOT NULL, "
+                    "created_at DATETIME NOT NULL, "
+                    "updated_at DATETIME NOT NULL)"
+                )
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO email_threads VALUES "
+                    "('legacy-1', 'thread-1', 'Legacy', '[\"a@example.com\", \"b@example.com\"]', "
+                    "'2024-01-01', '2024-01-01'), "
+                    "('legacy-2', 'thread-2', 'Broken', 'not json', '2024-01-01', '2024-01-01')"
+                )
+            )
+
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(migrate_legacy_participants)
+            # Running it again on the migrated schema is a no-op
+            await conn.run_sync(migrate_legacy_participants)
+
+            columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns("email_threads"))
+            assert "participants" not in {column["name"] for column in columns}
+            participants = await conn.execute(
+                text("SELECT thread_id, email FROM thread_participants ORDER BY thread_id, email")
+            )
+            assert participants.all() == [("legacy-1", "a@example.com"), ("legacy-1", "b@example.com")]
+            # New threads can be inserted again
+            await conn.execute(
+                text(
+                    "INSERT INTO email_threads (id, thread_id, subject, created_at, updated_at) "
+                    "VALUES ('new-1', 'thread-3', 'New', '2024-01-02', '2024-01-02')"
+                )
+            )
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_create_missing_indexes() -> None:
+    """Test that an index added to a model after its table was created is created on an existing database."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("DROP INDEX ix_email_messages_thread_id_received_at"))
+
+            await conn.run_sync(create_missing_indexes)
+            # Running it again with every index in place is a no-op
+            await conn.run_sync(create_missing_indexes)
+
+            indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("email_messages"))
+            assert "ix_email_messages_thread_id_received_at" in {index["name"] for index in indexes}
+    finally:
+        await engine.dispose()
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ulid import ULID
 
@@ -16,7 +16,6 @@ class EmailThread(Base):
     id: Mapped[str] = mapped_column(String(26), primary_key=True, default=lambda: str(ULID()))
     thread_id: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     subject: Mapped[str] = mapped_column(String(255))
-    participants: Mapped[str] = mapped_column(String(2048), default="[]")  # Serialized list of participants' emails
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -24,6 +23,10 @@ class EmailThread(Base):
     messages: Mapped[List["EmailMessage"]] = relationship(
         "EmailMessage", back_populates="thread", cascade="all, delete-orphan"
     )
+    # Relationship with ThreadParticipant
+    participants: Mapped[List["ThreadParticipant"]] = relationship(
+        "ThreadParticipant", back_populates="thread", cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"EmailThread(id={self.id}, thread_id={self.thread_id}, subject={self.subject})"
@@ -33,10 +36,12 @@ class EmailMessage(Base):
     """Model representing an individual email message within a thread."""
 
     __tablename__ = "email_messages"
+    # Serves "messages of a thread, oldest first" with one range scan and no sort; also covers thread_id lookups
+    __table_args__ = (Index("ix_email_messages_thread_id_received_at", "thread_id", "received_at"),)
 
     id: Mapped[str] = mapped_column(String(26), primary_key=True, default=lambda: str(ULID()))
     message_id: Mapped[str] = mapped_column(String(255), unique=True, index=True)
-    thread_id: Mapped[str] = mapped_column(String(36), ForeignKey("email_threads.id"), index=True)
+    thread_id: Mapped[str] = mapped_column(String(36), ForeignKey("email_threads.id"))
     sender: Mapped[str] = mapped_column(String(255))
     recipients: Mapped[str] = mapped_column(String(1024))  # Comma-separated list of recipients
     cc: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)  # Comma-separated list of CC recipients
@@ -53,3 +58,20 @@ class EmailMessage(Base):
 
     def __repr__(self) -> str:
         return f"EmailMessage(id={self.id}, message_id={self.message_id}, subject={self.subject})"
+
+
+class ThreadParticipant(Base):
+    """Model representing one email address taking part in a thread."""
+
+    __tablename__ = "thread_participants"
+
+    # The composite key makes each address unique per thread, so adding participants is an insert that ignores
+    # conflicts instead of a read-modify-write of the whole list
+    thread_id: Mapped[str] = mapped_column(String(26), ForeignKey("email_threads.id"), primary_key=True)
+    email: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    # Relationship with EmailThread
+    thread: Mapped["EmailThread"] = relationship("EmailThread", back_populates="participants")
+
+    def __repr__(self) -> str:
+        return f"ThreadParticipant(thread_id={self.thread_id}, email={self.email})"
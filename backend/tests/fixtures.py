@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from typing import Dict, Any, cast
 
-from sampark.db.database import Base
+from sampark.db.database import Base, use_explicit_transactions
 
 # Use in-memory SQLite database for tests
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -19,6 +19,7 @@ TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 async def test_engine():  # type: ignore
     """Create a test database engine using in-memory SQLite."""
     engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    use_explicit_transactions(engine)
 
     # Create all tables
     async with engine.begin() as conn: